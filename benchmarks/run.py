@@ -0,0 +1,185 @@
+"""
+Runs the benchmarks and optionally compares them against a stored baseline.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.2
+
+The exit code is 1, if any benchmark is slower than the baseline by more than the tolerance.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from simple_filters import Filter, PolynomialFilterStrategy, Tracker
+from benchmarks.scenarios import random_walk, tracking_frames
+
+FULL = {
+    "history_size": [10, 50, 200],
+    "poly_degree": [1, 3],
+    "dimensions": [2, 8],
+    "reject_outliers": [True, False],
+    "objects": [10, 100, 500],
+    "density": [0.1, 1.0],
+    "churn": [0.0, 0.1],
+}
+
+QUICK = {
+    "history_size": [10, 50],
+    "poly_degree": [3],
+    "dimensions": [2],
+    "reject_outliers": [True, False],
+    "objects": [10, 100],
+    "density": [1.0],
+    "churn": [0.1],
+}
+
+def filter_update(history_size, dimensions): 
+    """
+    Filter.update of a single filter, per sample
+    """
+    filter = Filter(PolynomialFilterStrategy(), history_size=history_size)
+    series = random_walk(1000, dimensions)
+
+    def run(): 
+        for state in series: 
+            filter.update(state)
+
+    return run, series.shape[0]
+
+def polynomial_eval(history_size, poly_degree, dimensions, reject_outliers): 
+    """
+    Filter.update followed by a prediction with the PolynomialFilterStrategy, per sample
+    """
+    strategy = PolynomialFilterStrategy(poly_degree=poly_degree, reject_outliers=reject_outliers)
+    filter = Filter(strategy, history_size=history_size)
+    series = random_walk(200, dimensions)
+
+    def run(): 
+        for state in series: 
+            filter.update(state)
+            filter.eval(time=1)
+
+    return run, series.shape[0]
+
+def tracker_update(objects, density, churn, reject_outliers): 
+    """
+    Tracker.update including the evaluation of the results, per frame
+    """
+    strategy = PolynomialFilterStrategy(poly_degree=2, reject_outliers=reject_outliers)
+    frames = tracking_frames(objects, 30, density=density, churn_rate=churn)
+
+    def run(): 
+        tracker = Tracker(Filter(strategy, history_size=10), max_time_to_live=3, time_to_birth=2, distance_threshold=1.0)
+        for states in frames: 
+            tracker.update(states)
+            tracker.to_numpy_array()
+
+    return run, len(frames)
+
+BENCHMARKS = [
+    ("filter.update", filter_update, ["history_size", "dimensions"]),
+    ("polynomial.eval", polynomial_eval, ["history_size", "poly_degree", "dimensions", "reject_outliers"]),
+    ("tracker.update", tracker_update, ["objects", "density", "churn", "reject_outliers"]),
+]
+
+def benchmark_cases(grid): 
+    """
+    Yields the name, the parameters and the setup function of all benchmarks for the grid of parameters
+    """
+    for group, setup, parameter_names in BENCHMARKS: 
+        for values in itertools.product(*[grid[name] for name in parameter_names]): 
+            parameters = dict(zip(parameter_names, values))
+            name = "%s(%s)" % (group, ",".join("%s=%s" % item for item in parameters.items()))
+
+            yield name, parameters, setup
+
+def measure(setup, parameters, repeat): 
+    """
+    Returns the median and the minimum time per operation in microseconds, each round runs on a fresh setup. 
+    A warm-up round is run first and not timed, so that imports and the module-level caches do not count. 
+    """
+    run, _ = setup(**parameters)
+    run()
+
+    timings = []
+    for _ in range(0, repeat): 
+        run, operations = setup(**parameters)
+
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) / operations * 1e6)
+
+    return float(np.median(timings)), float(np.min(timings))
+
+def run_benchmarks(grid, select=None, repeat=5): 
+    results = []
+    for name, parameters, setup in benchmark_cases(grid): 
+        if select is not None and select not in name: 
+            continue
+
+        median, minimum = measure(setup, parameters, repeat)
+        results.append({"name": name, "parameters": parameters, "median_us": median, "min_us": minimum})
+        print("%-90s %12.2f us" % (name, median))
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance=0.2): 
+    """
+    Compares the medians of all benchmarks, which exist in both reports.
+    Returns a list of (name, baseline, current, ratio) of all benchmarks that are slower than the tolerance.
+    """
+    baseline_medians = {result["name"]: result["median_us"] for result in baseline["results"]}
+
+    regressions = []
+    for result in report["results"]: 
+        if result["name"] not in baseline_medians: 
+            continue
+
+        ratio = result["median_us"] / baseline_medians[result["name"]]
+        if ratio > 1 + tolerance: 
+            regressions.append((result["name"], baseline_medians[result["name"]], result["median_us"], ratio))
+
+    return regressions
+
+def main(args=None): 
+    parser = argparse.ArgumentParser(description="Runs the benchmarks of simple_filters")
+    parser.add_argument("--quick", action="store_true", help="run a reduced set of parameters")
+    parser.add_argument("--select", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="number of rounds per benchmark")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown that counts as a regression")
+    args = parser.parse_args(args)
+
+    report = run_benchmarks(QUICK if args.quick else FULL, select=args.select, repeat=args.repeat)
+
+    if args.output is not None: 
+        with open(args.output, "w") as f: 
+            json.dump(report, f, indent=2)
+
+    if args.baseline is not None: 
+        with open(args.baseline, "r") as f: 
+            baseline = json.load(f)
+
+        regressions = compare(report, baseline, tolerance=args.tolerance)
+        for name, baseline_median, median, ratio in regressions: 
+            print("REGRESSION %s: %.2f us -> %.2f us (%.2fx)" % (name, baseline_median, median, ratio))
+
+        if len(regressions) > 0: 
+            return 1
+
+    return 0
+
+if __name__ == "__main__": 
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Synthetic, reproducible inputs for the benchmarks.
+"""
+
+import numpy as np
+
+def random_walk(length, dimensions, seed=0): 
+    """
+    Returns a random walk with the shape (length, dimensions)
+    """
+    rng = np.random.RandomState(seed)
+    return np.cumsum(rng.randn(length, dimensions), axis=0)
+
+def tracking_frames(number_of_objects, number_of_frames, density=1.0, churn_rate=0.0, noise=0.05, dimensions=2, seed=0): 
+    """
+    Returns a list of frames with the detections (N, dimensions) of objects which move with a constant velocity.
+
+    * **density**: The number of objects per unit area, the area grows with the number of objects.
+      With a distance threshold of 1, a density above 1 makes the matching ambiguous.
+    * **churn_rate**: The probability per frame, that an object disappears and a new object appears somewhere else.
+    * **noise**: The standard deviation of the detections around the true positions.
+    """
+    rng = np.random.RandomState(seed)
+    extent = np.sqrt(number_of_objects / density)
+
+    positions = rng.uniform(0, extent, size=(number_of_objects, dimensions))
+    velocities = rng.uniform(-0.1, 0.1, size=(number_of_objects, dimensions))
+
+    frames = []
+    for _ in range(0, number_of_frames): 
+        positions += velocities
+
+        # replaced objects start at a random position and are new to the tracker
+        replaced = rng.uniform(size=number_of_objects) < churn_rate
+        positions[replaced] = rng.uniform(0, extent, size=(np.count_nonzero(replaced), dimensions))
+
+        detections = positions + rng.normal(scale=noise, size=positions.shape)
+        frames.append(detections[rng.permutation(number_of_objects)])
+
+    return frames
@@ -1,5 +1,16 @@
 from .filter import Filter, FilterStrategy
 from .numpy_filter_strategy import NumpyFilterStrategy
+from .reducers import RunningReducer, RunningPercentile
 from .polynomial_filter_strategy import PolynomialFilterStrategy
+from .recursive_polynomial_filter_strategy import RecursivePolynomialFilterStrategy
 from .dummy_filter_strategy import DummyFilterStrategy
-from .tracker import Tracker, TrackedObject
\ No newline at end of file
+from .kalman_filter_strategy import KalmanFilterStrategy
+from .filter_bank import FilterBank
+from .distance import euclidean_distance, mahalanobis_diagonal_distance, predicted_mahalanobis_distance, iou_distance
+from .tracker import Tracker, TrackedObject
+from .tracker_stats import UpdateStats
+from .tracker_events import TrackEvents
+from .replay import iter_frames, replay, replay_to_columns, sweep
+from .tracker_pool import TrackerPool
+from .sharded_tracker import ShardedTracker
+from .async_tracker import AsyncTracker
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""
+Assignment of tracked objects to new states. Besides the dense minimum weight matching, a sparse
+variant is implemented, which only considers candidate pairs within the distance threshold. The
+bipartite graph of candidates is split into connected components, which are solved independently.
+
+The dense solvers take a distance matrix and the threshold and return the matched object and state 
+indices, whose distance does not exceed the threshold: 
+* **hungarian**: The optimal matching of scipy's linear_sum_assignment.
+* **auction**: Bertsekas' auction algorithm with epsilon scaling, which is optimal up to a small tolerance.
+* **greedy**: Matches the closest pairs first, which is fast but not optimal in case of conflicts.
+* **auto**: Chooses by the size and the sparsity of the candidates, see auto_assignment. As it only considers
+  the pairs within the threshold, the matching can differ from the hungarian solver on the full matrix.
+
+SciPy is only imported once it is needed, as the import is slow compared to short-lived processes.
+"""
+
+import numpy as np
+
+def dense_assignment(distance_matrix, distance_threshold): 
+    """
+    Applies minimum weight matching to the full distance matrix and returns the matched
+    object and state indices, whose distance does not exceed the threshold
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    object_indices, state_indices = linear_sum_assignment(distance_matrix)
+    valid = distance_matrix[object_indices, state_indices] <= distance_threshold
+
+    return object_indices[valid], state_indices[valid]
+
+def greedy_assignment(distance_matrix, distance_threshold): 
+    """
+    Matches the candidate pairs within the threshold in the order of increasing distance, 
+    skipping pairs whose object or state has already been matched
+    """
+    object_indices, state_indices, distances = matrix_candidates(distance_matrix, distance_threshold)
+    order = np.argsort(distances, kind="stable")
+
+    objects_matched = np.zeros(distance_matrix.shape[0], dtype=bool)
+    states_matched = np.zeros(distance_matrix.shape[1], dtype=bool)
+    matches = []
+    for i in order.tolist(): 
+        o, s = object_indices[i], state_indices[i]
+        if not objects_matched[o] and not states_matched[s]: 
+            objects_matched[o] = states_matched[s] = True
+            matches.append(i)
+
+    matches = np.array(matches, dtype=int)
+    return object_indices[matches], state_indices[matches]
+
+def auction_assignment(distance_matrix, distance_threshold, tolerance=1e-9): 
+    """
+    Applies the auction algorithm to the distance matrix, whose distances are clipped above the threshold. 
+    The total distance of the matching is optimal up to the tolerance times the size of the distances.
+    """
+    transposed = distance_matrix.shape[0] > distance_matrix.shape[1]
+    cost = distance_matrix.T if transposed else distance_matrix
+
+    # without any pair within the threshold, nothing can be matched
+    if cost.size == 0 or not (cost <= distance_threshold).any(): 
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    # all pairs beyond the threshold are equally bad, which keeps the range of the benefits small
+    benefit = -np.minimum(cost, distance_threshold + 1.0)
+    bidders = _auction(benefit, tolerance)
+    items = np.arange(cost.shape[0])
+
+    object_indices, state_indices = (bidders, items) if transposed else (items, bidders)
+    valid = distance_matrix[object_indices, state_indices] <= distance_threshold
+
+    return object_indices[valid], state_indices[valid]
+
+def auto_assignment(distance_matrix, distance_threshold, sparse_size=64, sparse_density=0.1): 
+    """
+    Chooses the solver by the candidate pairs within the threshold: 
+    * Without conflicts, i.e. if every object and every state has at most one candidate, all candidates are matched. 
+    * With a single object or state, the closest candidate is matched. 
+    * Large problems, whose candidates are sparse, are split into independent components. 
+    * Otherwise, the rows and columns with candidates are solved with the hungarian solver, or with the 
+      auction solver if SciPy is not available. 
+    """
+    candidates = distance_matrix <= distance_threshold
+    object_counts = candidates.sum(axis=1)
+    state_counts = candidates.sum(axis=0)
+
+    if object_counts.max(initial=0) <= 1 and state_counts.max(initial=0) <= 1: 
+        return np.nonzero(candidates)
+
+    if distance_matrix.shape[0] == 1: 
+        return np.zeros(1, dtype=int), np.argmin(distance_matrix, axis=1)
+
+    if distance_matrix.shape[1] == 1: 
+        return np.argmin(distance_matrix, axis=0), np.zeros(1, dtype=int)
+
+    objects = np.flatnonzero(object_counts)
+    states = np.flatnonzero(state_counts)
+
+    try: 
+        if min(objects.size, states.size) >= sparse_size and candidates.sum() < sparse_density * objects.size * states.size: 
+            return sparse_assignment(*matrix_candidates(distance_matrix, distance_threshold), *distance_matrix.shape)
+
+        object_indices, state_indices = dense_assignment(distance_matrix[np.ix_(objects, states)], distance_threshold)
+    except ImportError: 
+        object_indices, state_indices = auction_assignment(distance_matrix[np.ix_(objects, states)], distance_threshold)
+
+    return objects[object_indices], states[state_indices]
+
+SOLVERS = {
+    "auto": auto_assignment, 
+    "hungarian": dense_assignment, 
+    "auction": auction_assignment, 
+    "greedy": greedy_assignment, 
+}
+
+def _auction(benefit, tolerance): 
+    """
+    Assigns each row to a distinct column, maximizing the total benefit with a Jacobi auction and 
+    epsilon scaling. The number of rows must not exceed the number of columns. Returns the column per row. 
+    """
+    rows, columns = benefit.shape
+    if rows == 1: 
+        return np.argmax(benefit, axis=1)
+
+    # the auction is only optimal for square problems, the missing rows are filled with dummies without benefit
+    if rows < columns: 
+        benefit = np.concatenate([benefit, np.full((columns - rows, columns), benefit.min())])
+
+    return _square_auction(benefit, tolerance)[:rows]
+
+def _square_auction(benefit, tolerance): 
+    rows, columns = benefit.shape
+
+    # epsilon is relative to the size of the benefits, so that the bids remain resolvable in float arithmetic
+    benefit_range = max(np.ptp(benefit), np.abs(benefit).max())
+    if benefit_range == 0: 
+        benefit_range = 1.0
+
+    prices = np.zeros(columns)
+    epsilon = benefit_range / 2.0
+    final_epsilon = benefit_range * tolerance / rows
+
+    while True: 
+        assigned = np.full(rows, -1)
+        owners = np.full(columns, -1)
+        unassigned = np.arange(rows)
+
+        while unassigned.size > 0: 
+            values = benefit[unassigned] - prices
+            best = np.argmax(values, axis=1)
+            best_values = values[np.arange(unassigned.size), best]
+
+            values[np.arange(unassigned.size), best] = -np.inf
+            second_values = values.max(axis=1)
+            bids = prices[best] + best_values - second_values + epsilon
+
+            # each column goes to its highest bidder, the previous owner has to bid again
+            order = np.lexsort((-bids, best))
+            first = np.ones(order.size, dtype=bool)
+            first[1:] = best[order[1:]] != best[order[:-1]]
+            winners = order[first]
+
+            won_columns = best[winners]
+            previous_owners = owners[won_columns]
+            assigned[previous_owners[previous_owners >= 0]] = -1
+
+            owners[won_columns] = unassigned[winners]
+            assigned[unassigned[winners]] = won_columns
+            prices[won_columns] = bids[winners]
+
+            unassigned = np.flatnonzero(assigned < 0)
+
+        if epsilon <= final_epsilon: 
+            return assigned
+
+        epsilon = max(epsilon / 5.0, final_epsilon)
+
+def euclidean_candidates(predictions, states, distance_threshold): 
+    """
+    Returns the candidate pairs (objects, states, distances) within the distance threshold
+    by querying a k-d tree over the predicted states
+    """
+    from scipy.spatial import cKDTree
+
+    tree = cKDTree(predictions)
+    neighbours = tree.query_ball_point(states, r=distance_threshold)
+
+    counts = np.array([len(n) for n in neighbours], dtype=int)
+    if counts.sum() == 0: 
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)
+
+    object_indices = np.concatenate([n for n in neighbours if len(n) > 0]).astype(int)
+    state_indices = np.repeat(np.arange(states.shape[0]), counts)
+    distances = np.linalg.norm(predictions[object_indices] - states[state_indices], axis=1)
+
+    return object_indices, state_indices, distances
+
+def matrix_candidates(distance_matrix, distance_threshold): 
+    """
+    Returns the candidate pairs (objects, states, distances) within the distance threshold of a dense distance matrix
+    """
+    object_indices, state_indices = np.nonzero(distance_matrix <= distance_threshold)
+    return object_indices, state_indices, distance_matrix[object_indices, state_indices]
+
+def sparse_assignment(object_indices, state_indices, distances, number_of_objects, number_of_states): 
+    """
+    Applies minimum weight matching to the candidate pairs. Each connected component of the candidate
+    graph is solved separately, components consisting of a single pair are matched directly.
+    """
+    if object_indices.size == 0: 
+        return object_indices, state_indices
+
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    # objects and states are nodes of one graph, the states are placed after the objects
+    graph = coo_matrix(
+        (np.ones(object_indices.size), (object_indices, state_indices + number_of_objects)),
+        shape=(number_of_objects + number_of_states, number_of_objects + number_of_states)
+    )
+    _, labels = connected_components(graph, directed=False)
+
+    # sort the candidate pairs by component to be able to iterate over the components
+    edge_labels = labels[object_indices]
+    order = np.argsort(edge_labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(edge_labels[order])) + 1
+
+    matched_objects = []
+    matched_states = []
+    for edges in np.split(order, boundaries): 
+        if edges.size == 1: 
+            matched_objects.append(object_indices[edges])
+            matched_states.append(state_indices[edges])
+            continue
+
+        objects, local_objects = np.unique(object_indices[edges], return_inverse=True)
+        states, local_states = np.unique(state_indices[edges], return_inverse=True)
+
+        # pairs which are not candidates get a cost higher than any valid matching
+        cost = np.full((objects.size, states.size), distances[edges].sum() + 1.0)
+        cost[local_objects, local_states] = distances[edges]
+
+        candidate = np.zeros(cost.shape, dtype=bool)
+        candidate[local_objects, local_states] = True
+
+        rows, columns = linear_sum_assignment(cost)
+        valid = candidate[rows, columns]
+
+        matched_objects.append(objects[rows[valid]])
+        matched_states.append(states[columns[valid]])
+
+    return np.concatenate(matched_objects), np.concatenate(matched_states)
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Asyncio front-end for the tracker, which keeps the latency bounded when frames arrive faster than they can be processed.
+"""
+
+import asyncio
+from collections import deque
+
+class AsyncTracker: 
+    """
+    Runs the updates of a tracker off the event loop and applies backpressure to the incoming frames.
+
+    At most max_pending_frames frames are queued. When the queue is full, or when a frame is older than
+    latency_budget seconds once it is processed, frames are skipped according to the policy:
+    * **drop_oldest**: The frame is dropped, the tracker does not notice the gap.
+    * **coast**: The frame is dropped, but the tracked objects are advanced with their predicted state.
+    """
+
+    POLICIES = ["drop_oldest", "coast"]
+
+    def __init__(self, tracker, latency_budget=None, max_pending_frames=1, policy="drop_oldest", raw=False, executor=None): 
+        if policy not in self.POLICIES: 
+            raise ValueError("Unknown policy: %s" % policy)
+
+        self.tracker = tracker
+        self.latency_budget = latency_budget
+        self.max_pending_frames = max_pending_frames
+        self.policy = policy
+        self.raw = raw
+        self.executor = executor
+
+        self.dropped_frames = 0
+
+    async def track(self, frames): 
+        """
+        Consumes an async iterable of frames and yields the tuples (frame_index, result of to_numpy_array) 
+        of all frames which have been processed. The frames are no longer read when the consumer stops, 
+        e.g. with a break, as soon as the event loop closes the generator. 
+        """
+        iterator = _TrackingIterator(self, frames)
+        try: 
+            async for result in iterator: 
+                yield result
+        finally: 
+            await iterator.aclose()
+
+class _TrackingIterator: 
+
+    def __init__(self, async_tracker, frames): 
+        self.__tracker = async_tracker
+        self.__frames = frames
+        self.__pending = deque()
+        self.__skipped_frames = 0
+        self.__reader = None
+        self.__available = None
+
+    def __aiter__(self): 
+        return self
+
+    async def __anext__(self): 
+        loop = asyncio.get_running_loop()
+        if self.__reader is None: 
+            self.__available = asyncio.Event()
+            self.__reader = asyncio.ensure_future(self.__read())
+
+        try: 
+            return await self.__next(loop)
+        except BaseException: 
+            # the reader is not needed anymore when the consumer stops, e.g. when it is cancelled
+            await self.aclose()
+            raise
+
+    async def aclose(self): 
+        """
+        Stops reading the frames, e.g. when the consumer leaves the iteration early
+        """
+        if self.__reader is None or self.__reader.done(): 
+            return
+
+        self.__reader.cancel()
+        try: 
+            await self.__reader
+        except asyncio.CancelledError: 
+            pass
+
+    async def __next(self, loop): 
+        while True: 
+            if len(self.__pending) == 0: 
+                if self.__reader.done(): 
+                    # raises the exception of the reader, if there is one
+                    self.__reader.result()
+                    raise StopAsyncIteration
+
+                self.__available.clear()
+                await self.__available.wait()
+                continue
+
+            frame_index, received, states = self.__pending.popleft()
+
+            latency_budget = self.__tracker.latency_budget
+            if latency_budget is not None and loop.time() - received > latency_budget: 
+                self.__skip()
+                continue
+
+            skipped_frames, self.__skipped_frames = self.__skipped_frames, 0
+            result = await loop.run_in_executor(self.__tracker.executor, self.__update, skipped_frames, states)
+
+            return frame_index, result
+
+    async def __read(self): 
+        loop = asyncio.get_running_loop()
+        frame_index = 0
+
+        try: 
+            async for states in self.__frames: 
+                if len(self.__pending) >= self.__tracker.max_pending_frames: 
+                    self.__pending.popleft()
+                    self.__skip()
+
+                self.__pending.append((frame_index, loop.time(), states))
+                self.__available.set()
+                frame_index += 1
+        finally: 
+            # wakes up the consumer, which stops or raises the exception of the reader
+            self.__available.set()
+
+    def __skip(self): 
+        self.__tracker.dropped_frames += 1
+
+        # skipped frames are coasted right before the next update, in the same worker call
+        if self.__tracker.policy == "coast": 
+            self.__skipped_frames += 1
+
+    def __update(self, skipped_frames, states): 
+        tracker = self.__tracker.tracker
+        tracker.coast(skipped_frames)
+        tracker.update(states)
+
+        return tracker.to_numpy_array(raw=self.__tracker.raw)
\ No newline at end of file
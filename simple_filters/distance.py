@@ -0,0 +1,50 @@
+"""
+Pairwise distance functions for the tracker. Each function takes the predicted states of the
+tracked objects (T, D) and the new states (S, D) and returns a (T, S) distance matrix.
+"""
+
+import numpy as np
+
+def euclidean_distance(predictions, states): 
+    delta = predictions[:, np.newaxis, :] - states[np.newaxis, :, :]
+    return np.sqrt(np.einsum("tsd,tsd->ts", delta, delta))
+
+def mahalanobis_diagonal_distance(variances): 
+    """
+    Returns a Mahalanobis distance function with a diagonal covariance, given by the variances (D,)
+    """
+    inverse_std = 1.0 / np.sqrt(np.asarray(variances, dtype=float))
+
+    def distance(predictions, states): 
+        return euclidean_distance(predictions * inverse_std, states * inverse_std)
+
+    return distance
+
+def predicted_mahalanobis_distance(predictions, states, variances): 
+    """
+    Returns the Mahalanobis distance with a diagonal covariance per tracked object, given by the variances (T, D) 
+    of the predictions. When the tracker uses this function, it passes the predicted variances of its filters, 
+    which requires a strategy that provides them, e.g. the KalmanFilterStrategy.
+    """
+    delta = (predictions[:, np.newaxis, :] - states[np.newaxis, :, :]) / np.sqrt(variances)[:, np.newaxis, :]
+    return np.sqrt(np.einsum("tsd,tsd->ts", delta, delta))
+
+def iou_distance(predictions, states): 
+    """
+    Returns 1 - IoU of axis-aligned boxes, which are given as [x1, y1, x2, y2, ...] in the first four dimensions
+    """
+    p = predictions[:, np.newaxis, :4]
+    s = states[np.newaxis, :, :4]
+
+    width = np.clip(np.minimum(p[..., 2], s[..., 2]) - np.maximum(p[..., 0], s[..., 0]), 0, None)
+    height = np.clip(np.minimum(p[..., 3], s[..., 3]) - np.maximum(p[..., 1], s[..., 1]), 0, None)
+    intersection = width * height
+
+    area_p = (p[..., 2] - p[..., 0]) * (p[..., 3] - p[..., 1])
+    area_s = (s[..., 2] - s[..., 0]) * (s[..., 3] - s[..., 1])
+    union = area_p + area_s - intersection
+
+    with np.errstate(divide="ignore", invalid="ignore"): 
+        iou = np.where(union > 0, intersection / union, 0.0)
+
+    return 1.0 - iou
\ No newline at end of file
@@ -18,4 +18,16 @@ class DummyFilterStrategy(FilterStrategy):
         if self.history is None or self.history.shape[0] == 0: 
             return None
 
-        return self.history[self.history.shape[0] - 1]
\ No newline at end of file
+        return self.history[self.history.shape[0] - 1].copy()
+
+    def eval_batch(self, histories, time=0): 
+        return histories[:, histories.shape[1] - 1]
+
+    def eval_horizons(self, times): 
+        if self.history is None or self.history.shape[0] == 0: 
+            return None
+
+        return np.repeat(self.history[self.history.shape[0] - 1:], len(times), axis=0)
+
+    def eval_batch_horizons(self, histories, times): 
+        return np.repeat(histories[:, histories.shape[1] - 1:], len(times), axis=1)
\ No newline at end of file
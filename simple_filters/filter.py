@@ -1,5 +1,7 @@
 from collections import deque
+from copy import copy
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 
 class FilterStrategy: 
 
@@ -7,46 +9,233 @@ class FilterStrategy:
         self.filter = None
 
     def update(self, history): 
+        """
+        Is called after each update of the filter with the new history. After Filter.update_many, the 
+        number of updates of the filter has increased by the number of added samples. As the history is 
+        valid until the next update, strategies can defer their work until eval is called. 
+        """
         raise NotImplementedError("Abstract base function called")
 
     def eval(self, time=0): 
         raise NotImplementedError("Abstract base function called")
 
+    def eval_batch(self, histories, time=0): 
+        """
+        Evaluates a stack of histories with the shape (N, history_length, D) and returns an (N, D) array. 
+        Strategies should override this with a vectorized implementation, the fallback applies 
+        update and eval to every history
+        """
+        results = []
+        for history in histories: 
+            self.update(history)
+            results.append(self.eval(time))
+
+        return np.array(results)
+
+    def eval_horizons(self, times): 
+        """
+        Evaluates the strategy at several times and returns an (H, D) array
+        """
+        return np.array([self.eval(time) for time in times])
+
+    def eval_batch_horizons(self, histories, times): 
+        """
+        Evaluates a stack of histories with the shape (N, history_length, D) at several times
+        and returns an (N, H, D) array
+        """
+        return np.stack([self.eval_batch(histories, time) for time in times], axis=1)
+
+    def row_state_shapes(self, state_shape): 
+        """
+        Strategies which keep a recursive state per filter, instead of working on the history, return a dict 
+        of name -> shape of their arrays for a state of the given shape. A FilterBank then stores each array 
+        for all rows and calls init_rows, update_rows, eval_rows, eval_rows_horizons and eval_rows_variance 
+        with the dict of the arrays of the affected rows instead of eval_batch. update_rows receives an optional 
+        boolean mask of the observed rows, the other rows have only been predicted and must not be corrected. 
+        """
+        return None
+
 class Filter: 
     """
     Implements a filter with a LIFO queue, according to the history size specified. 
     A filter strategy must be supplied, which does the actual filtering
+
+    The history is kept in a preallocated, doubled ring buffer: every sample is written twice,
+    at position i and i + history_size. This way, the last history_size samples are always
+    available as a contiguous, chronologically ordered view and no memory is allocated
+    once the buffer is initialized.
+
+    With memoize enabled, the results of eval and eval_horizons are cached per time until the next 
+    update. Copies of the cached results are returned, cache_hits and cache_misses count the calls 
+    which have been answered from the cache or by the strategy.
+
+    The history is stored with the given dtype, e.g. np.float32 to halve the memory and bandwidth. 
+    The strategies compute their results in the dtype of the history.
     """
 
-    def __init__(self, strategy, history_size=10): 
+    def __init__(self, strategy, history_size=10, memoize=True, dtype=float): 
         self.history = None
         self.history_size = history_size
+        self.dtype = np.dtype(dtype)
         self.strategy = strategy
+        self.strategy.filter = self
+
+        # the number of samples that have been added, which allows strategies to work incrementally
+        self.number_of_updates = 0
 
-    def update(self, state):
-        if self.history is None: 
-            self.history = np.array([state])
-            self.strategy.update(self.history)
-            return 
-
-        # a ring buffer would of course be more efficient 
-        # but require resorting when applying the filter strategies
-        history_length = self.history.shape[0]
-        if history_length >= self.history_size: 
-            self.history = self.history[1:]
-        
-        self.history = np.append(self.history, [state], axis=0)
+        self.memoize = memoize
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.__cache = {}
+
+        self.__buffer = None
+        self.__end = 0
+
+    def update(self, state): 
+        if self.__buffer is None: 
+            state = np.asarray(state, dtype=self.dtype)
+            self.__buffer = np.empty((2 * self.history_size,) + state.shape, dtype=self.dtype)
+            self.__end = self.history_size
+
+        # the end index always points behind the latest sample in the upper half of the buffer
+        self.__end += 1
+        if self.__end > 2 * self.history_size: 
+            self.__end = self.history_size + 1
+
+        index = self.__end - 1
+        self.__buffer[index] = state
+        self.__buffer[index - self.history_size] = state
+
+        # the history is a view to the buffer, the oldest sample is at index 0
+        history_length = 1 if self.history is None else min(self.history.shape[0] + 1, self.history_size)
+        self.history = self.__buffer[self.__end - history_length:self.__end]
+        self.number_of_updates += 1
+        self.__cache.clear()
+        self.strategy.update(self.history)
+
+    def update_many(self, states): 
+        """
+        Adds a chunk of states (K, D) at once, which equals calling update for each of them. 
+        The strategy is only notified once, with the number of updates increased by K, 
+        so that it can defer its work until the next eval. Strategies with a recursive state 
+        (see FilterStrategy.row_state_shapes) are notified once per history_size samples instead, 
+        so that every sample of the chunk is in one of their histories. 
+        """
+        states = np.asarray(states, dtype=self.dtype)
+        count = states.shape[0]
+        if count == 0: 
+            return
+
+        if count > self.history_size and self.strategy.row_state_shapes(states.shape[1:]) is not None: 
+            for start in range(0, count, self.history_size): 
+                self.update_many(states[start:start + self.history_size])
+
+            return
+
+        # only the latest history_size samples are kept in the buffer
+        kept = states[max(count - self.history_size, 0):]
+        if self.__buffer is None: 
+            self.__buffer = np.empty((2 * self.history_size,) + kept.shape[1:], dtype=self.dtype)
+            self.__end = self.history_size
+
+        # the samples are written to the following slots of both halves, wrapping around at the end
+        slots = (self.__end - self.history_size + np.arange(kept.shape[0])) % self.history_size
+        self.__buffer[slots] = kept
+        self.__buffer[slots + self.history_size] = kept
+        self.__end = int(slots[-1]) + self.history_size + 1
+
+        history_length = count if self.history is None else self.history.shape[0] + count
+        history_length = min(history_length, self.history_size)
+        self.history = self.__buffer[self.__end - history_length:self.__end]
+        self.number_of_updates += count
+        self.__cache.clear()
         self.strategy.update(self.history)
 
     def get_history(self): 
+        """
+        Returns the history in chronological order. Note that this is a view to the internal
+        buffer, which is only valid until the next update.
+        """
         return self.history
 
     def eval(self, time=0): 
-        return self.strategy.eval(time)
+        return self.__memoized(time, self.strategy.eval, time)
+
+    def eval_horizons(self, times): 
+        """
+        Evaluates the filter at several times at once, e.g. to predict a trajectory with times=range(1, 31), 
+        and returns an (H, D) array
+        """
+        times = tuple(times)
+        return self.__memoized(times, self.strategy.eval_horizons, times)
+
+    def filter_series(self, series, time=0): 
+        """
+        Filters a whole series with the shape (T, D) at once. The result equals adding every sample 
+        with update and evaluating the filter afterwards, starting with an empty history. 
+        The filter itself is not changed. 
+        """
+        series = np.ascontiguousarray(series, dtype=self.dtype)
+        length = series.shape[0]
+        result = np.empty(series.shape, dtype=self.dtype)
+
+        # a recursive state depends on all previous samples and not only on the window, so it is run once over the series
+        shapes = self.strategy.row_state_shapes(series.shape[1:])
+        if shapes is not None: 
+            rows = {name: np.empty((1,) + shape, dtype=self.dtype) for name, shape in shapes.items()}
+            for i in range(0, length): 
+                if i == 0: 
+                    self.strategy.init_rows(rows, series[np.newaxis, 0])
+                else: 
+                    self.strategy.update_rows(rows, series[np.newaxis, i])
+
+                result[i] = self.strategy.eval_rows(rows, time)[0]
+
+            return result
+
+        # strategies without a vectorized implementation are applied to a copy, as the fallback updates the strategy
+        strategy = self.strategy
+        if type(strategy).eval_batch is FilterStrategy.eval_batch: 
+            strategy = copy(strategy)
+
+        # while the history is filling up, each sample is evaluated separately
+        for i in range(0, min(self.history_size - 1, length)): 
+            result[i] = strategy.eval_batch(series[np.newaxis, :i + 1], time)[0]
+
+        # afterwards, all windows are evaluated at once with a zero-copy view (T - history_size + 1, history_size, D)
+        if length >= self.history_size: 
+            windows = as_strided(
+                series, 
+                shape=(length - self.history_size + 1, self.history_size) + series.shape[1:], 
+                strides=(series.strides[0],) + series.strides, 
+                writeable=False
+            )
+            result[self.history_size - 1:] = strategy.eval_batch(windows, time)
+
+        return result
 
     def raw(self, time=0): 
         # we center the time around the latest sample, which will be T=0
         history_size = self.history.shape[0]
         offset_time = history_size + time - 1 
 
-        return self.history[offset_time]
\ No newline at end of file
+        return self.history[offset_time].copy()
+
+    def __memoized(self, key, evaluate, *args): 
+        if not self.memoize: 
+            return evaluate(*args)
+
+        result = self.__cache.get(key)
+        if result is not None: 
+            self.cache_hits += 1
+            return result.copy()
+
+        self.cache_misses += 1
+        result = evaluate(*args)
+
+        # the cache keeps its own array, so that the callers can change the results
+        if isinstance(result, np.ndarray): 
+            self.__cache[key] = result
+            result = result.copy()
+
+        return result
\ No newline at end of file
@@ -0,0 +1,284 @@
+import numpy as np
+
+class FilterBank: 
+    """
+    Implements many independent filters, which share the same strategy and history size.
+    All histories are stored in a single doubled ring buffer with the shape (N, 2 * history_size, D),
+    so that all rows are updated and evaluated in a few vectorized operations.
+
+    Rows are addressed by their index. When a row is removed, the last row is moved into its place.
+
+    As in the Filter, the results are cached per time until the rows are changed, if memoize is enabled. 
+    A single row is answered from the results of all rows.
+
+    For strategies with a recursive state per filter (see FilterStrategy.row_state_shapes), the states of 
+    all rows are stored in the bank as well and are updated and evaluated at once. 
+    """
+
+    def __init__(self, strategy, history_size=10, capacity=16, memoize=True, dtype=float): 
+        self.history_size = history_size
+        self.strategy = strategy
+        self.dtype = np.dtype(dtype)
+
+        self.memoize = memoize
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.__cache = {}
+
+        self.__capacity = capacity
+        self.__size = 0
+        self.__buffer = None
+        self.__lengths = np.zeros(capacity, dtype=int)
+        self.__row_states = None
+
+        # all rows share the end index, which points behind the latest sample in the upper half of the buffer
+        self.__end = history_size + 1
+
+    def __len__(self): 
+        return self.__size
+
+    def add(self, state): 
+        """
+        Adds a new row with the given initial state and returns its index
+        """
+        state = np.asarray(state, dtype=self.dtype)
+        if self.__buffer is None: 
+            self.__allocate(state.shape)
+
+        if self.__size == self.__capacity: 
+            self.__grow()
+
+        row = self.__size
+        self.__size += 1
+        self.__cache.clear()
+
+        index = self.__end - 1
+        self.__buffer[row, index] = state
+        self.__buffer[row, index - self.history_size] = state
+        self.__lengths[row] = 1
+
+        if self.__row_states is not None: 
+            self.strategy.init_rows(self.__rows(slice(row, row + 1)), state[np.newaxis])
+
+        return row
+
+    def remove(self, row): 
+        """
+        Removes the given row, the last row takes its index
+        """
+        last = self.__size - 1
+        if row != last: 
+            self.__buffer[row] = self.__buffer[last]
+            self.__lengths[row] = self.__lengths[last]
+
+            if self.__row_states is not None: 
+                for column in self.__row_states.values(): 
+                    column[row] = column[last]
+
+        self.__size -= 1
+        self.__cache.clear()
+
+    def update(self, states, observed=None): 
+        """
+        Appends one state per row, the states must have the shape (N, D). The optional boolean mask (N,) 
+        marks the rows whose states have been observed, the states of the other rows are predictions, 
+        which recursive strategies do not use as a measurement.
+        """
+        self.__end += 1
+        if self.__end > 2 * self.history_size: 
+            self.__end = self.history_size + 1
+
+        self.__cache.clear()
+        if self.__size == 0: 
+            return
+
+        index = self.__end - 1
+        self.__buffer[:self.__size, index] = states
+        self.__buffer[:self.__size, index - self.history_size] = states
+
+        lengths = self.__lengths[:self.__size]
+        np.minimum(lengths + 1, self.history_size, out=lengths)
+
+        if self.__row_states is not None: 
+            self.strategy.update_rows(self.__rows(slice(0, self.__size)), self.__buffer[:self.__size, index], observed)
+
+    def get_histories(self): 
+        """
+        Returns the histories of all rows as an (N, history_size, D) view and the number of valid samples per row. 
+        The samples of a row with the length L are the last L ones.
+        """
+        if self.__buffer is None: 
+            return np.empty((0, self.history_size, 0), dtype=self.dtype), np.empty(0, dtype=int)
+
+        return self.__buffer[:self.__size, self.__end - self.history_size:self.__end], self.__lengths[:self.__size]
+
+    def get_row_states(self): 
+        """
+        Returns the recursive states of all rows as a dict of name -> (N, ...) views, which is empty 
+        for strategies without a state per row
+        """
+        return {} if self.__row_states is None else self.__rows(slice(0, self.__size))
+
+    def set_histories(self, histories, lengths, row_states=None): 
+        """
+        Replaces all rows by the given histories (N, history_size, D) with the number of valid samples per row. 
+        The recursive states of the rows are initialized with the latest samples, unless they are given. 
+        """
+        histories = np.asarray(histories)
+        if histories.shape[1] != self.history_size: 
+            raise ValueError("The histories have the size %d instead of %d" % (histories.shape[1], self.history_size))
+
+        self.__capacity = max(self.__capacity, histories.shape[0])
+        self.__size = histories.shape[0]
+        self.__cache.clear()
+
+        # without any rows, the dimension is not known yet
+        if self.__size == 0: 
+            self.__buffer = None
+            self.__row_states = None
+            return
+
+        self.__allocate(histories.shape[2:])
+
+        # both halves of the ring buffer contain the histories, the end index points behind the upper half
+        self.__buffer[:self.__size, :self.history_size] = histories
+        self.__buffer[:self.__size, self.history_size:] = histories
+        self.__lengths[:self.__size] = lengths
+        self.__end = 2 * self.history_size
+
+        if self.__row_states is not None: 
+            rows = self.__rows(slice(0, self.__size))
+            if row_states: 
+                for name, column in rows.items(): 
+                    column[:] = row_states[name]
+            else: 
+                self.strategy.init_rows(rows, histories[:, self.history_size - 1])
+
+    def get_history(self, row): 
+        length = self.__lengths[row]
+        return self.__buffer[row, self.__end - length:self.__end]
+
+    def eval(self, time=0): 
+        """
+        Evaluates the strategy for all rows and returns an (N, D) array
+        """
+        return self.__eval_time(time, copy=True)
+
+    def eval_horizons(self, times): 
+        """
+        Evaluates the strategy for all rows at several times and returns an (N, H, D) array
+        """
+        return self.__eval_times(tuple(times), copy=True)
+
+    def eval_variance(self, time=1): 
+        """
+        Returns the variance of the predicted states (N, D) of all rows, which is only available 
+        for strategies with a recursive state that provide eval_rows_variance
+        """
+        if self.__row_states is None or not hasattr(self.strategy, "eval_rows_variance"): 
+            raise ValueError("The strategy %s does not provide variances" % type(self.strategy).__name__)
+
+        return self.__memoized(("variance", time), lambda: self.strategy.eval_rows_variance(self.__rows(slice(0, self.__size)), time))
+
+    def eval_row(self, row, time=0): 
+        """
+        Evaluates the strategy for a single row
+        """
+        if self.memoize: 
+            return self.__eval_time(time, copy=False)[row].copy()
+
+        if self.__row_states is not None: 
+            return self.strategy.eval_rows(self.__rows(slice(row, row + 1)), time)[0]
+
+        return self.strategy.eval_batch(self.get_history(row)[np.newaxis], time)[0]
+
+    def eval_row_horizons(self, row, times): 
+        if self.memoize: 
+            return self.__eval_times(tuple(times), copy=False)[row].copy()
+
+        if self.__row_states is not None: 
+            return self.strategy.eval_rows_horizons(self.__rows(slice(row, row + 1)), times)[0]
+
+        return self.strategy.eval_batch_horizons(self.get_history(row)[np.newaxis], times)[0]
+
+    def raw(self, time=0): 
+        # we center the time around the latest sample, which will be T=0
+        return self.__buffer[:self.__size, self.__end - 1 + time].copy()
+
+    def __allocate(self, state_shape): 
+        self.__buffer = np.empty((self.__capacity, 2 * self.history_size) + tuple(state_shape), dtype=self.dtype)
+        self.__lengths = np.zeros(self.__capacity, dtype=int)
+
+        shapes = self.strategy.row_state_shapes(tuple(state_shape))
+        if shapes is not None: 
+            self.__row_states = {name: np.zeros((self.__capacity,) + shape, dtype=self.dtype) for name, shape in shapes.items()}
+
+    def __rows(self, rows): 
+        return {name: column[rows] for name, column in self.__row_states.items()}
+
+    def __eval_time(self, time, copy): 
+        if self.__row_states is not None: 
+            return self.__memoized(time, lambda: self.strategy.eval_rows(self.__rows(slice(0, self.__size)), time), copy)
+
+        return self.__memoized(time, lambda: self.__eval(lambda histories: self.strategy.eval_batch(histories, time), ()), copy)
+
+    def __eval_times(self, times, copy): 
+        if self.__row_states is not None: 
+            return self.__memoized(times, lambda: self.strategy.eval_rows_horizons(self.__rows(slice(0, self.__size)), times), copy)
+
+        return self.__memoized(times, lambda: self.__eval(lambda histories: self.strategy.eval_batch_horizons(histories, times), (len(times),)), copy)
+
+    def __memoized(self, key, evaluate, copy=True): 
+        if not self.memoize: 
+            return evaluate()
+
+        # the cache keeps its own arrays, the callers receive copies which they can change
+        result = self.__cache.get(key)
+        if result is not None: 
+            self.cache_hits += 1
+        else: 
+            self.cache_misses += 1
+            result = evaluate()
+            self.__cache[key] = result
+
+        return result.copy() if copy else result
+
+    def __eval(self, evaluate, horizon_shape): 
+        if self.__buffer is None: 
+            return np.empty((0,) + horizon_shape + (0,), dtype=self.dtype)
+
+        result = np.empty((self.__size,) + horizon_shape + self.__buffer.shape[2:], dtype=self.dtype)
+        if self.__size == 0: 
+            return result
+
+        lengths = self.__lengths[:self.__size]
+        unique_lengths = np.unique(lengths)
+        if unique_lengths.size == 1: 
+            length = unique_lengths[0]
+            result[:] = evaluate(self.__buffer[:self.__size, self.__end - length:self.__end])
+            return result
+
+        # rows which are not filled yet are evaluated in groups of the same history length
+        for length in unique_lengths: 
+            rows = np.flatnonzero(lengths == length)
+            histories = self.__buffer[rows, self.__end - length:self.__end]
+            result[rows] = evaluate(histories)
+
+        return result
+
+    def __grow(self): 
+        self.__capacity *= 2
+
+        buffer = np.empty((self.__capacity,) + self.__buffer.shape[1:], dtype=self.dtype)
+        buffer[:self.__size] = self.__buffer[:self.__size]
+        self.__buffer = buffer
+
+        lengths = np.zeros(self.__capacity, dtype=int)
+        lengths[:self.__size] = self.__lengths[:self.__size]
+        self.__lengths = lengths
+
+        if self.__row_states is not None: 
+            for name, column in self.__row_states.items(): 
+                resized = np.zeros((self.__capacity,) + column.shape[1:], dtype=self.dtype)
+                resized[:self.__size] = column[:self.__size]
+                self.__row_states[name] = resized
\ No newline at end of file
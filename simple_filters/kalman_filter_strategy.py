@@ -0,0 +1,186 @@
+from functools import lru_cache
+from math import factorial
+
+import numpy as np
+
+from . import FilterStrategy
+
+MODELS = {"constant_velocity": 2, "constant_acceleration": 3}
+
+@lru_cache(maxsize=64)
+def _transition(order, time): 
+    """
+    Returns the transition matrix of the given order for a step of the given time, which may be negative
+    """
+    transition = np.eye(order)
+    for k in range(1, order): 
+        transition += np.diag(np.full(order - k, float(time) ** k / np.prod(np.arange(1, k + 1))), k)
+
+    transition.setflags(write=False)
+    return transition
+
+@lru_cache(maxsize=64)
+def _process_covariance(order, process_noise): 
+    """
+    Returns the covariance of the process noise for a single step, which is a constant random change 
+    of the highest derivative during the step
+    """
+    gain = np.array([1.0 / factorial(order - i) for i in range(0, order)])
+    covariance = process_noise * np.outer(gain, gain)
+
+    covariance.setflags(write=False)
+    return covariance
+
+@lru_cache(maxsize=256)
+def _prediction_terms(order, process_noise, times): 
+    """
+    Returns the position rows of the transitions (H, order) and the accumulated
+    process covariances (H, order, order) for predicting the given times. The covariances 
+    of fractional times are interpolated linearly between the whole steps.
+    """
+    positions = np.array([_transition(order, time)[0] for time in times])
+
+    covariances = np.zeros((len(times), order, order))
+    for i, time in enumerate(times): 
+        steps = max(time, 0)
+        for step in range(0, int(np.ceil(steps))): 
+            transition = _transition(order, step)
+            covariances[i] += min(steps - step, 1.0) * (transition @ _process_covariance(order, process_noise) @ transition.T)
+
+    for term in [positions, covariances]: 
+        term.setflags(write=False)
+
+    return positions, covariances
+
+class KalmanFilterStrategy(FilterStrategy): 
+    """
+    Implements a Kalman filter with a constant velocity or constant acceleration model per dimension,
+    with the time step of one update. Each dimension is observed directly and has the same noise, so that
+    all dimensions share one covariance matrix of the size of the model order. The update and the prediction
+    are recursive and do not depend on the history, whose size can be as small as 1.
+
+    * **process_noise**: The variance of the random change of the velocity (or acceleration) per step.
+    * **measurement_noise**: The variance of the measured states.
+    * **initial_variance**: The initial variance of the velocity (and acceleration).
+
+    In a FilterBank, e.g. in the tracker, the state of each row is stored in the bank and all rows are updated at once.
+    The predicted variance of the states is available with eval_variance, e.g. for gating with a Mahalanobis distance.
+    Filter.filter_series runs the filter once over the series, stacks of histories without a state, e.g. in eval_batch, 
+    are filtered from their first sample.
+    """
+
+    def __init__(self, model="constant_velocity", process_noise=1e-2, measurement_noise=1e-1, initial_variance=1.0): 
+        super().__init__()
+
+        if model not in MODELS: 
+            raise ValueError("Unknown model: %s" % model)
+
+        self.model = model
+        self.order = MODELS[model]
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.initial_variance = initial_variance
+        self.history = None
+
+        self.__rows = None
+        self.__number_of_updates = None
+
+    def update(self, history): 
+        self.history = history
+
+        # the new samples are added to the state, if they are all in the history, otherwise the filter is run over the whole history
+        number_of_updates = None if self.filter is None else self.filter.number_of_updates
+        added = None if self.__rows is None or number_of_updates is None else number_of_updates - self.__number_of_updates
+        if added is not None and 0 < added <= history.shape[0]: 
+            for i in range(history.shape[0] - added, history.shape[0]): 
+                self.update_rows(self.__rows, history[np.newaxis, i])
+        else: 
+            self.__rows = self.__run(history[np.newaxis])
+
+        self.__number_of_updates = number_of_updates
+
+    def eval(self, time=0): 
+        if self.history is None or self.history.shape[0] == 0: 
+            return None
+
+        return self.eval_rows(self.__rows, time)[0]
+
+    def eval_horizons(self, times): 
+        if self.history is None or self.history.shape[0] == 0: 
+            return None
+
+        return self.eval_rows_horizons(self.__rows, times)[0]
+
+    def eval_variance(self, time=1): 
+        """
+        Returns the variance of the predicted state (D,), including the measurement noise
+        """
+        if self.history is None or self.history.shape[0] == 0: 
+            return None
+
+        return self.eval_rows_variance(self.__rows, time)[0]
+
+    def eval_batch(self, histories, time=0): 
+        return self.eval_rows(self.__run(histories), time)
+
+    def eval_batch_horizons(self, histories, times): 
+        return self.eval_rows_horizons(self.__run(histories), times)
+
+    def row_state_shapes(self, state_shape): 
+        return {"mean": (self.order,) + tuple(state_shape), "covariance": (self.order, self.order)}
+
+    def init_rows(self, rows, states): 
+        rows["mean"][:] = 0
+        rows["mean"][:, 0] = states
+
+        rows["covariance"][:] = np.diag([self.measurement_noise] + [self.initial_variance] * (self.order - 1))
+
+    def update_rows(self, rows, states, observed=None): 
+        """
+        Applies the prediction and the update step to all rows, with one new state (N, D) per row. 
+        Rows which are not marked in the optional boolean mask observed (N,) are only predicted.
+        """
+        mean = rows["mean"]
+        covariance = rows["covariance"]
+        transition = _transition(self.order, 1)
+
+        # prediction
+        mean[:] = transition @ mean
+        covariance[:] = transition @ covariance @ transition.T + _process_covariance(self.order, self.process_noise)
+
+        # update, only the first entry of the state is observed
+        innovation = states - mean[:, 0]
+        innovation_variance = covariance[:, 0, 0] + self.measurement_noise
+        gain = covariance[:, :, 0] / innovation_variance[:, np.newaxis]
+        if observed is not None: 
+            gain[~np.asarray(observed, dtype=bool)] = 0
+
+        mean += gain[:, :, np.newaxis] * innovation[:, np.newaxis, :]
+        covariance -= gain[:, :, np.newaxis] * covariance[:, np.newaxis, 0, :]
+
+    def eval_rows(self, rows, time=0): 
+        return self.eval_rows_horizons(rows, [time])[:, 0]
+
+    def eval_rows_horizons(self, rows, times): 
+        positions, _ = _prediction_terms(self.order, self.process_noise, tuple(float(time) for time in times))
+        return positions.astype(rows["mean"].dtype) @ rows["mean"]
+
+    def eval_rows_variance(self, rows, time=1): 
+        """
+        Returns the variance of the predicted states (N, D) of all rows
+        """
+        positions, covariances = _prediction_terms(self.order, self.process_noise, (float(time),))
+        variance = np.einsum("i,nij,j->n", positions[0], rows["covariance"], positions[0]) + covariances[0, 0, 0]
+
+        shape = rows["mean"].shape
+        return np.broadcast_to((variance + self.measurement_noise)[:, np.newaxis], (shape[0],) + shape[2:]).astype(rows["mean"].dtype)
+
+    def __run(self, histories): 
+        # the state of each history is initialized with its first sample and updated with the following ones
+        rows = {name: np.empty((histories.shape[0],) + shape, dtype=histories.dtype) for name, shape in self.row_state_shapes(histories.shape[2:]).items()}
+        self.init_rows(rows, histories[:, 0])
+
+        for i in range(1, histories.shape[1]): 
+            self.update_rows(rows, histories[:, i])
+
+        return rows
@@ -1,22 +1,89 @@
 import numpy as np
 
 from . import FilterStrategy
+from .reducers import running_reducer
 
 class NumpyFilterStrategy(FilterStrategy): 
     """
-    Simply returns the latest item
+    Applies a numpy function (e.g. np.mean or np.median) to the history.
+
+    For np.sum, np.mean, np.var, np.std, np.min, np.max and np.median, as well as for instances of
+    RunningReducer, the result is maintained incrementally with each update. Any other function is
+    applied to the whole history on evaluation. After several samples have been added at once, the
+    reducer is reset from the history on the next evaluation.
     """
 
     def __init__(self, numpy_function): 
         super().__init__()
         self.history = None
-        self.__numpy_function = numpy_function
+        self.__reducer = running_reducer(numpy_function)
+        self.__numpy_function = numpy_function if self.__reducer is None else self.__reducer.function
+
+        self.__oldest = None
+        self.__number_of_updates = None
+        self.__stale = True
+        self.__updates_since_refresh = 0
 
     def update(self, history): 
+        previous_history = self.history
         self.history = history
 
+        if self.__reducer is None: 
+            return
+
+        # the reducer can only be updated incrementally, if exactly one sample has been added to the window
+        number_of_updates = None if self.filter is None else self.filter.number_of_updates
+        is_incremental = (
+            not self.__stale and
+            number_of_updates is not None and
+            number_of_updates == self.__number_of_updates + 1 and
+            previous_history is not None and
+            previous_history.shape[0] in [history.shape[0] - 1, history.shape[0]] and
+            (self.__reducer.exact or self.__updates_since_refresh < history.shape[0])
+        )
+
+        if is_incremental: 
+            if previous_history.shape[0] == history.shape[0]: 
+                self.__reducer.remove(self.__oldest)
+
+            self.__reducer.add(history[history.shape[0] - 1])
+            self.__updates_since_refresh += 1
+
+            # the oldest sample is kept, as it will be overwritten in the history before it is evicted
+            np.copyto(self.__oldest, history[0])
+        else: 
+            # the reducer is reset from the history on the next evaluation
+            self.__stale = True
+
+        self.__number_of_updates = number_of_updates
+
     def eval(self, time=0): 
         if self.history is None or self.history.shape[0] == 0: 
             return None
 
-        return self.__numpy_function(self.history, axis=0)
\ No newline at end of file
+        if self.__reducer is not None: 
+            if self.__stale: 
+                self.__refresh()
+
+            return self.__reducer.value()
+
+        return self.__numpy_function(self.history, axis=0)
+
+    def eval_batch(self, histories, time=0): 
+        return self.__numpy_function(histories, axis=1)
+
+    def eval_horizons(self, times): 
+        if self.history is None or self.history.shape[0] == 0: 
+            return None
+
+        # the result does not depend on the time
+        return np.repeat(self.eval()[np.newaxis], len(times), axis=0)
+
+    def eval_batch_horizons(self, histories, times): 
+        return np.repeat(self.eval_batch(histories)[:, np.newaxis], len(times), axis=1)
+
+    def __refresh(self): 
+        self.__reducer.reset(self.history)
+        self.__oldest = np.array(self.history[0])
+        self.__updates_since_refresh = 0
+        self.__stale = False
@@ -1,14 +1,52 @@
+from functools import lru_cache
+
 import numpy as np
 
 from . import FilterStrategy
 
+def _normalize(length, t): 
+    """
+    Maps the time t of a history with the given length to the normalized x-axis [-1, 1], 
+    which keeps the least-squares problems well conditioned
+    """
+    center = (length - 1) / 2.0
+    scale = max(center, 1.0)
+
+    return (np.asarray(t, dtype=float) - center) / scale
+
+@lru_cache(maxsize=256)
+def _vander(length, poly_degree): 
+    vander = np.vander(_normalize(length, np.arange(length)), poly_degree + 1)
+    vander.setflags(write=False)
+
+    return vander
+
+@lru_cache(maxsize=256)
+def _horizon_weights(length, poly_degree, times, dtype=np.dtype(float)): 
+    """
+    Returns the weights W with one row per time, so that W @ x equals the values at the times 
+    of the least-squares polynomial fitted to x sampled at 0..length-1. The weights are computed
+    in double precision and converted to the dtype of the histories.
+    """
+    vander_t = np.vander(_normalize(length, np.array(times)), poly_degree + 1)
+
+    weights = (vander_t @ np.linalg.pinv(_vander(length, poly_degree))).astype(dtype)
+    weights.setflags(write=False)
+
+    return weights
+
 class PolynomialFilterStrategy(FilterStrategy): 
-    """ 
+    """
     The filter strategy implements a simple Savitzky-Golay filter
     https://en.wikipedia.org/wiki/Savitzky%E2%80%93Golay_filter
 
-    A performance-oriented outlier detection is implemented via thresholding the median difference 
+    A performance-oriented outlier detection is implemented via thresholding the median difference
     to the median, multiplied by the outlier_rejection_ratio
+
+    As the x-axis is fixed, the filtered value is a linear combination of the history, whose weights
+    are cached per history length, polynomial degree and times, so that several horizons are evaluated
+    in one matrix product. A full polynomial fit is only done for dimensions in which outliers have been
+    rejected, all of them are solved at once.
     """
 
     def __init__(self, poly_degree=3, reject_outliers=True, outlier_rejection_ratio=2.0, filter_weight=1.0, max_items=None): 
@@ -27,68 +65,112 @@ class PolynomialFilterStrategy(FilterStrategy):
         self.history = history
         self.__poly_fn = None
 
-    def eval(self, time=0):
+    def eval(self, time=0): 
+        predictions = self.eval_horizons([time])
+        return None if predictions is None else predictions[0]
+
+    def eval_batch(self, histories, time=0): 
+        """
+        Evaluates a stack of histories with the shape (N, history_length, D) in one pass
+        """
+        return self.eval_batch_horizons(histories, [time])[:, 0]
+
+    def eval_horizons(self, times): 
         if self.history is None or self.history.shape[0] == 0: 
             return None
 
-        # we center the time around the latest sample, which will be T=0
-        history_size = self.history.shape[0]
-        offset_time = history_size + time - 1 
+        histories = self.history[np.newaxis]
+
+        # if the polynomial functions are not existent, calculate them
+        if self.__poly_fn is None and self.__is_fitted(histories): 
+            self.__poly_fn = self.__fit_polynomials(histories)
 
+        return self.__predict(histories, times, self.__poly_fn)[0]
+
+    def eval_batch_horizons(self, histories, times): 
+        poly_fn = self.__fit_polynomials(histories) if self.__is_fitted(histories) else None
+
+        return self.__predict(histories, times, poly_fn)
+
+    def __is_fitted(self, histories): 
         # for debugging purposes
         if self.poly_degree == 0: 
-            return self.history[history_size - 1]
+            return False
 
         # in the case that the equation is underdetermined, we cannot predict a polynomial
         # simply return the last state in the history
-        if history_size < self.poly_degree + 1: 
-            return self.history[history_size - 1]
-        
-        # if the polynomial functions are not existent, calculate them
-        if self.__poly_fn is None: 
-            self.__update_polynomials()
-            
-        predictions = self.__eval_polynomials(offset_time)
+        return histories.shape[1] >= self.poly_degree + 1
 
-        # finally applying a weight to the prediction
-        if time <= 0: 
-            result = (self.filter_weight * predictions) + ((1 - self.filter_weight) * self.history[offset_time])
-        else:
-            result = predictions
-
-        return result
+    def __predict(self, histories, times, poly_fn): 
+        """
+        Predicts the states at all times and returns an (N, H, D) array
+        """
+        # we center the time around the latest sample, which will be T=0
+        history_size = histories.shape[1]
+        times = np.asarray(times, dtype=float)
+        offset_times = history_size + times - 1
 
-    def __eval_polynomials(self, t): 
-        length = self.history.shape[1]
-        predicted_states = np.zeros(length)
+        if not self.__is_fitted(histories): 
+            return np.repeat(histories[:, history_size - 1:history_size], times.size, axis=1)
 
-        for i in range(0, length): 
-            predicted_states[i] = self.__poly_fn[i](t)
+        predictions = self.__eval_polynomials(histories, offset_times, poly_fn)
 
-        return predicted_states
-
-    def __update_polynomials(self): 
-        self.__poly_fn = []
-        for i in range(0, self.history.shape[1]): 
-            self.__poly_fn.append(self.__calc_polynomial(self.history[:, i]))
+        # finally applying a weight to the prediction
+        # fractional times are blended with the nearest raw sample
+        past = times <= 0
+        if past.any(): 
+            samples = histories[:, np.rint(offset_times[past]).astype(int)]
+            predictions[:, past] = (self.filter_weight * predictions[:, past]) + ((1 - self.filter_weight) * samples)
 
-    def __calc_polynomial(self, x): 
-        length = x.shape[0]
-        y = np.arange(length)
+        return predictions
 
-        if self.reject_outliers: 
-            # reject outliers that are far awy from the median
-            # determine the median of the mean absolute difference as a threshold
-            delta = np.abs(x - np.median(x))
-            rel_delta = delta / np.median(delta)
-            
-            mask = rel_delta < self.outlier_rejection_ratio
+    def __eval_polynomials(self, histories, offset_times, poly_fn): 
+        # dimensions without outliers are evaluated with the cached projection weights, all times in one product
+        weights = _horizon_weights(histories.shape[1], self.poly_degree, tuple(offset_times.tolist()), histories.dtype)
+        predicted_states = weights @ histories
 
-            x = x[mask]
-            y = y[mask]
+        rows, columns, coeffs = poly_fn
+        if rows.size > 0: 
+            predicted_states[rows, :, columns] = coeffs @ np.vander(offset_times, self.poly_degree + 1).T
 
-        # now fit the filter function
-        coeffs = np.polyfit(y, x, self.poly_degree)
-        poly_fn = np.poly1d(coeffs)
+        return predicted_states
 
-        return poly_fn
+    def __fit_polynomials(self, histories): 
+        """
+        Fits the polynomials of all dimensions that contain outliers in one weighted least-squares solve, 
+        the rejected samples are expressed as zero weights
+        """
+        rows = columns = np.empty(0, dtype=int)
+        if not self.reject_outliers: 
+            return rows, columns, np.empty((0, self.poly_degree + 1))
+
+        mask = self.__inlier_mask(histories)
+        rows, columns = np.nonzero(~mask.all(axis=1))
+        if rows.size == 0: 
+            return rows, columns, np.empty((0, self.poly_degree + 1))
+
+        # one weighted vandermonde matrix per dimension, solved as a stack
+        # the columns are scaled and the cutoff is chosen like in np.polyfit, so that the results are equivalent
+        weights = mask[rows, :, columns].astype(float)
+        values = histories[rows, :, columns]
+        vander = weights[:, :, np.newaxis] * np.vander(np.arange(histories.shape[1]), self.poly_degree + 1)
+
+        scale = np.sqrt((vander * vander).sum(axis=1))
+        scale[scale == 0] = 1.0
+        rcond = weights.sum(axis=1) * np.finfo(float).eps
+
+        coeffs = np.linalg.pinv(vander / scale[:, np.newaxis, :], rcond=rcond) @ (weights * values)[:, :, np.newaxis]
+
+        return rows, columns, coeffs[:, :, 0] / scale
+
+    def __inlier_mask(self, histories): 
+        # reject outliers that are far awy from the median
+        # determine the median of the mean absolute difference as a threshold
+        delta = np.abs(histories - np.median(histories, axis=1, keepdims=True))
+        median_delta = np.median(delta, axis=1, keepdims=True)
+
+        with np.errstate(divide="ignore", invalid="ignore"): 
+            rel_delta = delta / median_delta
+
+        # samples which equal the median are always kept, which covers constant dimensions
+        return (rel_delta < self.outlier_rejection_ratio) | (delta == 0)
\ No newline at end of file
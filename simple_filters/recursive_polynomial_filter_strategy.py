@@ -0,0 +1,168 @@
+from functools import lru_cache
+
+import numpy as np
+
+from . import FilterStrategy
+from .polynomial_filter_strategy import _normalize, _vander, _horizon_weights
+
+@lru_cache(maxsize=256)
+def _moment_weights(length, poly_degree, times): 
+    """
+    Returns the weights W with one row per time, so that W @ m equals the values at the times of the 
+    least-squares polynomial, where m are the moments of the history on the normalized x-axis
+    """
+    vander = _vander(length, poly_degree)
+    vander_t = np.vander(_normalize(length, np.array(times)), poly_degree + 1)
+
+    weights = vander_t @ np.linalg.inv(vander.T @ vander)
+    weights.setflags(write=False)
+
+    return weights
+
+@lru_cache(maxsize=256)
+def _slide_terms(length, poly_degree): 
+    """
+    Returns the terms to update the moments, when all samples move one step to the past: 
+    the shift matrix, and the columns of the evicted and the new sample. The powers are in 
+    decreasing order, as in np.vander.
+    """
+    delta = -(_normalize(length, 1) - _normalize(length, 0))
+
+    # (u + delta)^k = sum_j binom(k, j) * delta^(k - j) * u^j
+    shift = np.zeros((poly_degree + 1, poly_degree + 1))
+    for k in range(0, poly_degree + 1): 
+        binomial = 1.0
+        for j in range(k, -1, -1): 
+            shift[poly_degree - k, poly_degree - j] = binomial * delta ** (k - j)
+            binomial = binomial * j / (k - j + 1)
+
+    # the evicted sample is removed before shifting
+    vander = _vander(length, poly_degree)
+    first = (shift @ vander[0])[:, np.newaxis]
+    last = vander[length - 1][:, np.newaxis]
+
+    for term in [shift, first, last]: 
+        term.setflags(write=False)
+
+    return shift, first, last
+
+class RecursivePolynomialFilterStrategy(FilterStrategy): 
+    """
+    Computes the same filter as the PolynomialFilterStrategy without outlier rejection, but maintains
+    the moments of the least-squares problem incrementally over the sliding window. Each update only
+    adds the new and removes the evicted sample, so the cost is independent of the history size.
+
+    The moments are kept on the normalized x-axis and are recomputed from the history every
+    history_size updates, so that rounding errors cannot accumulate. After several samples have 
+    been added at once, they are recomputed on the next evaluation.
+    """
+
+    def __init__(self, poly_degree=3, filter_weight=1.0): 
+        super().__init__()
+
+        self.poly_degree = poly_degree
+        self.filter_weight = filter_weight
+        self.history = None
+
+        self.__moments = None
+        self.__oldest = None
+        self.__number_of_updates = None
+        self.__stale = True
+        self.__updates_since_refresh = 0
+
+    def update(self, history): 
+        previous_history = self.history
+        self.history = history
+
+        # the moments can only be updated incrementally, if exactly one sample has been added to the full window
+        length = history.shape[0]
+        number_of_updates = None if self.filter is None else self.filter.number_of_updates
+        is_incremental = (
+            not self.__stale and
+            length >= self.poly_degree + 1 and
+            number_of_updates is not None and
+            number_of_updates == self.__number_of_updates + 1 and
+            previous_history is not None and
+            previous_history.shape[0] == length and
+            self.__updates_since_refresh < length
+        )
+
+        if is_incremental: 
+            self.__slide(history)
+            self.__updates_since_refresh += 1
+
+            # the oldest sample is kept, as it will be overwritten in the history before it is evicted
+            np.copyto(self.__oldest, history[0])
+        else: 
+            # the moments are recomputed from the history on the next evaluation
+            self.__stale = True
+
+        self.__number_of_updates = number_of_updates
+
+    def eval(self, time=0): 
+        predictions = self.eval_horizons([time])
+        return None if predictions is None else predictions[0]
+
+    def eval_batch(self, histories, time=0): 
+        return self.eval_batch_horizons(histories, [time])[:, 0]
+
+    def eval_horizons(self, times): 
+        if self.history is None or self.history.shape[0] == 0: 
+            return None
+
+        # we center the time around the latest sample, which will be T=0
+        history_size = self.history.shape[0]
+        times = np.asarray(times, dtype=float)
+        offset_times = history_size + times - 1
+
+        # for debugging purposes, or in the case that the equation is underdetermined
+        if self.poly_degree == 0 or history_size < self.poly_degree + 1: 
+            return np.repeat(self.history[history_size - 1:], times.size, axis=0)
+
+        if self.__stale: 
+            self.__refresh()
+
+        # the moments are kept in double precision, the result has the dtype of the history
+        predictions = _moment_weights(history_size, self.poly_degree, tuple(offset_times.tolist())) @ self.__moments
+        predictions = predictions.astype(self.history.dtype, copy=False)
+
+        return self.__blend(predictions[np.newaxis], self.history[np.newaxis], times, offset_times)[0]
+
+    def eval_batch_horizons(self, histories, times): 
+        # without a sliding window, the filter is a plain projection of the histories
+        history_size = histories.shape[1]
+        times = np.asarray(times, dtype=float)
+        offset_times = history_size + times - 1
+
+        if self.poly_degree == 0 or history_size < self.poly_degree + 1: 
+            return np.repeat(histories[:, history_size - 1:], times.size, axis=1)
+
+        predictions = _horizon_weights(history_size, self.poly_degree, tuple(offset_times.tolist()), histories.dtype) @ histories
+
+        return self.__blend(predictions, histories, times, offset_times)
+
+    def __blend(self, predictions, histories, times, offset_times): 
+        # finally applying a weight to the predictions of the past, fractional times use the nearest raw sample
+        past = times <= 0
+        if past.any(): 
+            samples = histories[:, np.rint(offset_times[past]).astype(int)]
+            predictions[:, past] = (self.filter_weight * predictions[:, past]) + ((1 - self.filter_weight) * samples)
+
+        return predictions
+
+    def __refresh(self): 
+        self.__moments = _vander(self.history.shape[0], self.poly_degree).T @ self.history
+        self.__oldest = np.array(self.history[0])
+        self.__updates_since_refresh = 0
+        self.__stale = False
+
+    def __slide(self, history): 
+        length = history.shape[0]
+        shift, first, last = _slide_terms(length, self.poly_degree)
+
+        # remove the evicted sample at the first position, move all samples one step and add the new one
+        moments = shift @ self.__moments
+        moments -= first * self.__oldest
+        moments += last * history[length - 1]
+
+        self.__moments = moments
\ No newline at end of file
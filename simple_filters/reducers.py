@@ -0,0 +1,206 @@
+"""
+Running reducers over a sliding window, which are updated with every added and removed sample
+instead of reducing the whole history on every evaluation.
+"""
+
+from bisect import bisect_left, insort
+from collections import deque
+
+import numpy as np
+
+class RunningReducer: 
+    """
+    Base class of the running reducers. The function is the equivalent numpy function, which is used
+    for evaluating whole histories at once. Reducers which are not exact are recomputed regularly.
+    """
+
+    function = None
+    exact = True
+
+    def reset(self, history): 
+        raise NotImplementedError("Abstract base function called")
+
+    def add(self, state): 
+        raise NotImplementedError("Abstract base function called")
+
+    def remove(self, state): 
+        raise NotImplementedError("Abstract base function called")
+
+    def value(self): 
+        raise NotImplementedError("Abstract base function called")
+
+class RunningSum(RunningReducer): 
+
+    function = staticmethod(np.sum)
+    exact = False
+
+    def reset(self, history): 
+        self.sum = np.sum(history, axis=0)
+        self.count = history.shape[0]
+
+    def add(self, state): 
+        self.sum += state
+        self.count += 1
+
+    def remove(self, state): 
+        self.sum -= state
+        self.count -= 1
+
+    def value(self): 
+        return self.sum.copy()
+
+class RunningMean(RunningSum): 
+
+    function = staticmethod(np.mean)
+
+    def value(self): 
+        return self.sum / self.count
+
+class RunningVariance(RunningReducer): 
+    """
+    Implements Welford's algorithm, with the removal of samples
+    """
+
+    exact = False
+
+    def __init__(self, ddof=0, sqrt=False): 
+        self.ddof = ddof
+        self.sqrt = sqrt
+
+    def function(self, histories, axis=0): 
+        if self.sqrt: 
+            return np.std(histories, axis=axis, ddof=self.ddof)
+
+        return np.var(histories, axis=axis, ddof=self.ddof)
+
+    def reset(self, history): 
+        self.count = history.shape[0]
+        self.mean = np.mean(history, axis=0)
+        self.m2 = np.sum((history - self.mean) ** 2, axis=0)
+
+    def add(self, state): 
+        self.count += 1
+        delta = state - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (state - self.mean)
+
+    def remove(self, state): 
+        self.count -= 1
+
+        # the window of a single sample is empty after the removal
+        if self.count == 0: 
+            self.mean = np.zeros_like(self.mean)
+            self.m2 = np.zeros_like(self.m2)
+            return
+
+        delta = state - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (state - self.mean)
+
+    def value(self): 
+        variance = np.clip(self.m2, 0, None) / (self.count - self.ddof)
+        return np.sqrt(variance) if self.sqrt else variance
+
+class RunningExtremum(RunningReducer): 
+    """
+    Keeps a monotonic deque per dimension, whose first item is the minimum (or maximum) of the window. 
+    The states are flattened, so that scalar states are supported as well.
+    """
+
+    def __init__(self, maximum=False): 
+        self.maximum = maximum
+
+    def function(self, histories, axis=0): 
+        return np.max(histories, axis=axis) if self.maximum else np.min(histories, axis=axis)
+
+    def reset(self, history): 
+        self.shape = history.shape[1:]
+        self.deques = [deque() for _ in range(0, int(np.prod(self.shape)))]
+        self.dtype = history.dtype
+        self.first = 0
+        self.next = 0
+
+        for state in history: 
+            self.add(state)
+
+    def add(self, state): 
+        sign = -1.0 if self.maximum else 1.0
+        state = np.ravel(state)
+        for d, items in enumerate(self.deques): 
+            value = sign * state[d]
+            while len(items) > 0 and items[-1][1] >= value: 
+                items.pop()
+
+            items.append((self.next, value))
+
+        self.next += 1
+
+    def remove(self, state): 
+        # the removed state is always the oldest one
+        for items in self.deques: 
+            if items[0][0] == self.first: 
+                items.popleft()
+
+        self.first += 1
+
+    def value(self): 
+        sign = -1.0 if self.maximum else 1.0
+        return np.array([sign * items[0][1] for items in self.deques], dtype=self.dtype).reshape(self.shape)
+
+class RunningPercentile(RunningReducer): 
+    """
+    Keeps a sorted window per dimension, the percentile is linearly interpolated like np.percentile. 
+    The states are flattened, so that scalar states are supported as well.
+    """
+
+    def __init__(self, q=50.): 
+        self.q = q
+
+    def function(self, histories, axis=0): 
+        return np.percentile(histories, self.q, axis=axis)
+
+    def reset(self, history): 
+        self.shape = history.shape[1:]
+        self.windows = [sorted(column) for column in history.reshape(history.shape[0], -1).T.tolist()]
+        self.dtype = history.dtype
+
+    def add(self, state): 
+        for window, value in zip(self.windows, np.ravel(state).tolist()): 
+            insort(window, value)
+
+    def remove(self, state): 
+        for window, value in zip(self.windows, np.ravel(state).tolist()): 
+            del window[bisect_left(window, value)]
+
+    def value(self): 
+        position = (len(self.windows[0]) - 1) * self.q / 100.
+        lower = int(np.floor(position))
+        upper = min(lower + 1, len(self.windows[0]) - 1)
+        fraction = position - lower
+
+        return np.array([window[lower] + (window[upper] - window[lower]) * fraction for window in self.windows], dtype=self.dtype).reshape(self.shape)
+
+def running_reducer(numpy_function): 
+    """
+    Returns a running reducer for the given numpy function, or None if there is no equivalent reducer
+    """
+    if isinstance(numpy_function, RunningReducer): 
+        return numpy_function
+
+    factories = [
+        (np.sum, RunningSum),
+        (np.mean, RunningMean),
+        (np.var, lambda: RunningVariance()),
+        (np.std, lambda: RunningVariance(sqrt=True)),
+        (np.min, lambda: RunningExtremum()),
+        (np.amin, lambda: RunningExtremum()),
+        (np.max, lambda: RunningExtremum(maximum=True)),
+        (np.amax, lambda: RunningExtremum(maximum=True)),
+        (np.median, lambda: RunningPercentile(50.)),
+    ]
+
+    for function, factory in factories: 
+        if numpy_function is function: 
+            return factory()
+
+    return None
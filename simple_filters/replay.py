@@ -0,0 +1,95 @@
+"""
+Offline replay of recorded detections through a tracker, e.g. to tune its parameters.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .tracker import Tracker
+
+def iter_frames(frame_indices, states, number_of_frames=None): 
+    """
+    Splits detections given column-wise, as sorted frame indices (M,) and states (M, D), into
+    one array per frame. Frames without detections yield empty arrays.
+    """
+    frame_indices = np.asarray(frame_indices, dtype=np.int64)
+    states = np.asarray(states)
+
+    if number_of_frames is None: 
+        number_of_frames = int(frame_indices[-1]) + 1 if frame_indices.size > 0 else 0
+
+    boundaries = np.searchsorted(frame_indices, np.arange(0, number_of_frames + 1))
+    for i in range(0, number_of_frames): 
+        yield states[boundaries[i]:boundaries[i + 1]]
+
+def replay(tracker, frames, raw=False): 
+    """
+    Updates the tracker with each frame and yields the frame index together with
+    the result of to_numpy_array, i.e. the states and ids of all born objects
+    """
+    for i, states in enumerate(frames): 
+        tracker.update(states)
+        yield i, tracker.to_numpy_array(raw=raw)
+
+def replay_to_columns(tracker, frames, raw=False, capacity=1024): 
+    """
+    Updates the tracker with each frame and collects the results column-wise.
+    Returns the frame indices (N,), the ids (N,) and the states (N, D) of all born objects in all frames.
+    """
+    frame_column = np.empty(capacity, dtype=np.int64)
+    id_column = np.empty(capacity, dtype=np.int64)
+    state_column = None
+    size = 0
+
+    for i, result in replay(tracker, frames, raw=raw): 
+        if result.size == 0: 
+            continue
+
+        if state_column is None: 
+            state_column = np.empty((capacity, result.shape[1] - 1), dtype=result.dtype)
+
+        # grow the preallocated columns if necessary
+        if size + result.shape[0] > frame_column.shape[0]: 
+            capacity = max(2 * frame_column.shape[0], size + result.shape[0])
+            frame_column = _resize(frame_column, capacity, size)
+            id_column = _resize(id_column, capacity, size)
+            state_column = _resize(state_column, capacity, size)
+
+        # the ids are taken from the tracker, as the float32 result cannot hold large ids exactly
+        frame_column[size:size + result.shape[0]] = i
+        id_column[size:size + result.shape[0]] = tracker.get_ids()
+        state_column[size:size + result.shape[0]] = result[:, :-1]
+        size += result.shape[0]
+
+    if state_column is None: 
+        state_column = np.empty((0, 0), dtype=np.float32)
+
+    return frame_column[:size], id_column[:size], state_column[:size]
+
+def sweep(filter_prototype, parameter_sets, frames, raw=False, processes=None): 
+    """
+    Replays the frames for each set of tracker parameters (e.g. distance_threshold, max_time_to_live
+    and time_to_birth) and returns a list with the columns of replay_to_columns per set.
+    The configurations are independent and are distributed over a process pool, unless processes is 1.
+    """
+    frames = [np.asarray(states) for states in frames]
+    jobs = [(filter_prototype, parameters, frames, raw) for parameters in parameter_sets]
+
+    if processes == 1: 
+        return [_replay_configuration(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor: 
+        return list(executor.map(_replay_configuration, jobs))
+
+def _replay_configuration(job): 
+    filter_prototype, parameters, frames, raw = job
+    tracker = Tracker(filter_prototype, **parameters)
+
+    return replay_to_columns(tracker, frames, raw=raw)
+
+def _resize(column, capacity, size): 
+    resized = np.empty((capacity,) + column.shape[1:], dtype=column.dtype)
+    resized[:size] = column[:size]
+
+    return resized
\ No newline at end of file
@@ -0,0 +1,409 @@
+"""
+Tracking of a single, very large scene, which is split into tiles that are tracked on a pool of workers.
+"""
+
+import itertools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .assignment import sparse_assignment
+
+class ShardedTracker: 
+    """
+    Partitions the state space into a grid of tiles of the tile_size along the given dimensions of the states.
+    Each tile has its own tracker, which is created with the tracker_factory and owns the objects whose predicted
+    state lies in the tile. The tiles are distributed over the workers, either threads (executor="thread")
+    or worker processes (executor="process"), in which case the tracker_factory must be picklable.
+    A tile always stays on the same worker.
+
+    Every update takes two steps, which run in parallel on the workers: 
+    * Each tile matches its objects to the states within the tile, extended by the margin on all sides.
+      The margin defaults to the largest distance threshold of the trackers and must not be smaller,
+      so that a tile sees all candidates of its objects if the distance is at least the euclidean
+      distance along the tiled dimensions.
+    * The tiles also return their candidate pairs within the distance threshold. The connected components 
+      of the candidates, which contain candidates of several tiles, are matched jointly, the other matches 
+      of the tiles are kept. The unmatched states are added to the tile which contains them, the ids are 
+      assigned in the order of the states like in a single tracker, so that they are globally unique and stable.
+      Afterwards, the objects whose predicted state has left their tile are handed off to the new tile.
+
+    With gating, the result equals a single tracker with gating, as each component is matched with all its candidates.
+    """
+
+    def __init__(self, tracker_factory, tile_size, margin=None, dimensions=(0, 1), executor="process", max_workers=None): 
+        if executor not in ["thread", "process"]: 
+            raise ValueError("Unknown executor: %s" % executor)
+
+        # the margin must cover the largest distance threshold of the tiles
+        tracker = tracker_factory()
+        distance_threshold = max([tracker.distance_threshold] + [
+            parameters["distance_threshold"] for parameters in tracker.class_parameters.values() if "distance_threshold" in parameters
+        ])
+
+        if margin is None: 
+            margin = distance_threshold
+        elif margin < distance_threshold: 
+            raise ValueError("The margin %s is smaller than the distance threshold %s" % (margin, distance_threshold))
+
+        self.tracker_factory = tracker_factory
+        self.dimensions = list(dimensions)
+        self.tile_size = np.broadcast_to(np.asarray(tile_size, dtype=float), (len(self.dimensions),)).copy()
+        self.margin = margin
+        self.executor = executor
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+
+        self.object_counter = 0
+
+        self.__workers = []
+        self.__thread_pool = None
+        self.__tile_workers = {}
+        self.__tile_sizes = {}
+        self.__handoffs = {}
+
+    def __enter__(self): 
+        return self
+
+    def __exit__(self, *args): 
+        self.close()
+
+    @property
+    def number_of_tiles(self): 
+        """
+        The number of tiles which currently own objects
+        """
+        return len(set(tile for tile, size in self.__tile_sizes.items() if size > 0) | set(self.__handoffs))
+
+    def update(self, states, labels=None, raw=False): 
+        """
+        Updates the tiles with the new states (N, D) and optionally their labels (N,), and returns the
+        to_numpy_array of all tiles, ordered by the id like the result of a single tracker
+        """
+        states = np.asarray(states, dtype=float)
+        if len(states.shape) == 1: 
+            states = states[np.newaxis] if states.size > 0 else states.reshape(0, 0)
+
+        number_of_states = states.shape[0]
+        labels = np.zeros(number_of_states, dtype=np.int64) if labels is None else np.asarray(labels, dtype=np.int64).reshape(-1)
+
+        positions = states[:, self.dimensions] if number_of_states > 0 else np.empty((0, len(self.dimensions)))
+        visible = self.__visible_states(positions)
+        home = _group(_tile_indices(positions, self.tile_size), np.arange(0, number_of_states))
+
+        ## Match the objects of each tile to the states within its margin
+        tiles = sorted(set(tile for tile, size in self.__tile_sizes.items() if size > 0) | set(self.__handoffs))
+        empty = np.empty(0, dtype=int)
+
+        batches = self.__batches(tiles, lambda tile: (
+            states[visible.get(tile, empty)], labels[visible.get(tile, empty)], self.__handoffs.pop(tile, [])
+        ))
+
+        # the claims of each tile are its matches and its candidate pairs within the distance threshold
+        claims = []
+        for tile, (matches, candidates) in self.__run("match", batches): 
+            indices = visible.get(tile, empty)
+            claims.append((tile, (matches[0], indices[matches[1]]), (candidates[0], indices[candidates[1]], candidates[2])))
+
+        ## Resolve the conflicts, the components of the candidate graph which span several tiles are matched jointly
+        matched_ids, matched_states = _resolve(claims, number_of_states)
+
+        states_matched = np.zeros(number_of_states, dtype=bool)
+        states_matched[np.concatenate(matched_states + [empty])] = True
+
+        # the unmatched states get new ids in their order
+        added_states = np.flatnonzero(~states_matched)
+        added_ids = np.arange(self.object_counter + 1, self.object_counter + 1 + added_states.size, dtype=np.int64)
+        self.object_counter += added_states.size
+
+        is_added = np.zeros(number_of_states, dtype=bool)
+        is_added[added_states] = True
+        new_ids = np.zeros(number_of_states, dtype=np.int64)
+        new_ids[added_states] = added_ids
+
+        ## Update each tile with its matches and its new states
+        matches = {claims[i][0]: (matched_ids[i], matched_states[i]) for i in range(0, len(claims))}
+        for tile, state_indices in home.items(): 
+            home[tile] = state_indices[is_added[state_indices]]
+
+        def update_batch(tile): 
+            ids, matched = matches.get(tile, (np.empty(0, dtype=np.int64), empty))
+            added = home.get(tile, empty)
+            indices = np.concatenate([matched, added])
+
+            return states[indices], labels[indices], (ids, np.arange(0, matched.size)), new_ids[added], raw
+
+        tiles = sorted(set(tiles) | set(tile for tile, added in home.items() if added.size > 0))
+        results = []
+        for tile, (result, size, handoffs) in self.__run("update", self.__batches(tiles, update_batch)): 
+            self.__tile_sizes[tile] = size
+            for destination, columns in handoffs.items(): 
+                self.__handoffs.setdefault(destination, []).append(columns)
+
+            if result.size > 0: 
+                results.append(result)
+
+        if len(results) == 0: 
+            return np.array([])
+
+        result = np.concatenate(results)
+        return result[np.argsort(result[:, -1], kind="stable")]
+
+    def close(self): 
+        if self.__thread_pool is not None: 
+            self.__thread_pool.shutdown()
+            self.__thread_pool = None
+
+        for worker in self.__workers: 
+            worker.close()
+
+        self.__workers = []
+        self.__tile_workers = {}
+        self.__tile_sizes = {}
+        self.__handoffs = {}
+
+    def __visible_states(self, positions): 
+        """
+        Returns a dict of tile -> indices of the states within the tile extended by the margin
+        """
+        low = _tile_indices(positions - self.margin, self.tile_size)
+        high = _tile_indices(positions + self.margin, self.tile_size)
+        span = int((high - low).max(initial=0)) + 1
+
+        # each state is visible in all tiles from low to high, which are enumerated by their offsets
+        keys = []
+        indices = []
+        for offset in itertools.product(range(0, span), repeat=len(self.dimensions)): 
+            tiles = low + np.array(offset, dtype=np.int64)
+            valid = np.flatnonzero((tiles <= high).all(axis=1))
+            keys.append(tiles[valid])
+            indices.append(valid)
+
+        return _group(np.concatenate(keys), np.concatenate(indices))
+
+    def __batches(self, tiles, batch): 
+        """
+        Returns the batch of each tile, grouped by the workers, which are started on first use
+        """
+        if len(self.__workers) == 0: 
+            if self.executor == "thread": 
+                self.__thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+                self.__workers = [_ThreadWorker(_Shard(self.tracker_factory, self.tile_size, self.dimensions), self.__thread_pool) for _ in range(0, self.max_workers)]
+            else: 
+                self.__workers = [_ProcessWorker(self.tracker_factory, self.tile_size, self.dimensions) for _ in range(0, self.max_workers)]
+
+        # tiles are assigned to the workers in a round robin fashion and stay there
+        batches = [{} for _ in self.__workers]
+        for tile in tiles: 
+            if tile not in self.__tile_workers: 
+                self.__tile_workers[tile] = len(self.__tile_workers) % len(self.__workers)
+
+            batches[self.__tile_workers[tile]][tile] = batch(tile)
+
+        return batches
+
+    def __run(self, method, batches): 
+        for worker, batch in zip(self.__workers, batches): 
+            if len(batch) > 0: 
+                worker.send(method, batch)
+
+        results = []
+        for worker, batch in zip(self.__workers, batches): 
+            if len(batch) > 0: 
+                results.extend(worker.receive().items())
+
+        return results
+
+def _resolve(claims, number_of_states): 
+    """
+    Returns the ids of the matched objects and the indices of their states per claim. The matches of a tile are kept, 
+    if no other tile has a candidate in the same connected component of the candidate graph. The other components 
+    are matched jointly with the candidates of all tiles, like in a single tracker with gating. 
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    matched_ids = [ids for _, (ids, _), _ in claims]
+    matched_states = [state_indices for _, (_, state_indices), _ in claims]
+
+    claim_indices = np.concatenate([np.full(candidates[0].size, i, dtype=int) for i, (_, _, candidates) in enumerate(claims)] + [np.empty(0, dtype=int)])
+    if claim_indices.size == 0: 
+        return matched_ids, matched_states
+
+    candidate_ids, candidate_states, distances = (np.concatenate(column) for column in zip(*[candidates for _, _, candidates in claims]))
+
+    # each object is owned by one tile, its candidates are connected to the states, which are placed after the objects
+    object_ids, object_indices = np.unique(candidate_ids, return_inverse=True)
+    number_of_objects = object_ids.size
+    graph = coo_matrix(
+        (np.ones(object_indices.size), (object_indices, candidate_states + number_of_objects)),
+        shape=(number_of_objects + number_of_states, number_of_objects + number_of_states)
+    )
+    _, components = connected_components(graph, directed=False)
+
+    # a component is contested, if the candidates of several tiles are part of it
+    edge_components = components[object_indices]
+    first_claims = np.full(components.max() + 1, -1, dtype=int)
+    first_claims[edge_components[::-1]] = claim_indices[::-1]
+    contested = np.zeros(components.max() + 1, dtype=bool)
+    contested[edge_components[claim_indices != first_claims[edge_components]]] = True
+
+    if not contested.any(): 
+        return matched_ids, matched_states
+
+    # the matches of the tiles in contested components are replaced by a joint assignment
+    for i, (ids, state_indices) in enumerate(zip(matched_ids, matched_states)): 
+        kept = ~contested[components[state_indices + number_of_objects]]
+        matched_ids[i] = ids[kept]
+        matched_states[i] = state_indices[kept]
+
+    edges = np.flatnonzero(contested[edge_components])
+    objects, states = sparse_assignment(object_indices[edges], candidate_states[edges], distances[edges], number_of_objects, number_of_states)
+
+    # the joint matches go to the tiles which own the objects
+    owners = np.empty(number_of_objects, dtype=int)
+    owners[object_indices] = claim_indices
+    for i in range(0, len(claims)): 
+        owned = owners[objects] == i
+        matched_ids[i] = np.concatenate([matched_ids[i], object_ids[objects[owned]]])
+        matched_states[i] = np.concatenate([matched_states[i], states[owned]])
+
+    return matched_ids, matched_states
+
+def _tile_indices(positions, tile_size): 
+    return np.floor(positions / tile_size).astype(np.int64)
+
+def _group(keys, indices): 
+    """
+    Groups the indices by their tile, given as the rows of keys, and returns a dict of tile -> sorted indices
+    """
+    if indices.size == 0: 
+        return {}
+
+    # the tiles are numbered within their bounding box to sort them at once
+    low = keys.min(axis=0)
+    codes = np.ravel_multi_index(tuple((keys - low).T), tuple(keys.max(axis=0) - low + 1))
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+
+    return {tuple(keys[group[0]].tolist()): np.sort(indices[group]) for group in np.split(order, boundaries)}
+
+class _Shard: 
+    """
+    The trackers of the tiles of one worker
+    """
+
+    def __init__(self, tracker_factory, tile_size, dimensions): 
+        self.tracker_factory = tracker_factory
+        self.tile_size = tile_size
+        self.dimensions = dimensions
+
+        self.__trackers = {}
+
+    def match(self, batch): 
+        results = {}
+        for tile, (states, labels, handoffs) in batch.items(): 
+            tracker = self.__tracker(tile)
+            for columns in handoffs: 
+                tracker.insert_tracks(columns)
+
+            results[tile] = tracker.match(states, labels, candidates=True)
+
+        return results
+
+    def update(self, batch): 
+        results = {}
+        for tile, (states, labels, matches, new_ids, raw) in batch.items(): 
+            tracker = self.__tracker(tile)
+            tracker.update(states, labels, matches=matches, new_ids=new_ids)
+            result = tracker.to_numpy_array(raw=raw)
+
+            # the objects whose prediction has left the tile are handed off to their new tile
+            handoffs = {}
+            ids, predictions = tracker.predict(time=1)
+            size = ids.size
+            if size > 0: 
+                destinations = _tile_indices(predictions[:, self.dimensions], self.tile_size)
+                leaving = np.flatnonzero((destinations != np.array(tile)).any(axis=1))
+                for destination, indices in _group(destinations[leaving], leaving).items(): 
+                    handoffs[destination] = tracker.extract_tracks(ids[indices])
+
+                size -= leaving.size
+
+            # trackers without objects are created again when needed
+            if size == 0: 
+                del self.__trackers[tile]
+
+            results[tile] = (result, size, handoffs)
+
+        return results
+
+    def __tracker(self, tile): 
+        if tile not in self.__trackers: 
+            self.__trackers[tile] = self.tracker_factory()
+
+        return self.__trackers[tile]
+
+class _ThreadWorker: 
+
+    def __init__(self, shard, thread_pool): 
+        self.__shard = shard
+        self.__thread_pool = thread_pool
+        self.__future = None
+
+    def send(self, method, batch): 
+        self.__future = self.__thread_pool.submit(getattr(self.__shard, method), batch)
+
+    def receive(self): 
+        return self.__future.result()
+
+    def close(self): 
+        pass
+
+class _ProcessWorker: 
+    """
+    A worker process with its own shard, the batches are sent through a pipe
+    """
+
+    def __init__(self, tracker_factory, tile_size, dimensions): 
+        self.__connection, worker_connection = multiprocessing.Pipe()
+        self.__process = multiprocessing.Process(target=_worker_main, args=(worker_connection, tracker_factory, tile_size, dimensions), daemon=True)
+        self.__process.start()
+
+    def send(self, method, batch): 
+        self.__connection.send((method, batch))
+
+    def receive(self): 
+        result = self.__connection.recv()
+        if isinstance(result, Exception): 
+            raise result
+
+        return result
+
+    def close(self): 
+        # the worker may have died already
+        try: 
+            if self.__process.is_alive(): 
+                self.__connection.send(None)
+                self.__process.join(timeout=5)
+        except (BrokenPipeError, EOFError, OSError): 
+            pass
+        finally: 
+            if self.__process.is_alive(): 
+                self.__process.terminate()
+
+            self.__connection.close()
+
+def _worker_main(connection, tracker_factory, tile_size, dimensions): 
+    shard = _Shard(tracker_factory, tile_size, dimensions)
+
+    while True: 
+        message = connection.recv()
+        if message is None: 
+            break
+
+        method, batch = message
+        try: 
+            connection.send(getattr(shard, method)(batch))
+        except Exception as e: 
+            connection.send(e)
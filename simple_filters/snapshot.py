@@ -0,0 +1,83 @@
+"""
+A compact, columnar binary format for the state of a tracker.
+
+The file starts with a magic string, followed by the length of a JSON header and the header itself,
+which describes the scalar values and the name, dtype, shape and offset of each column. The columns
+follow as raw arrays, aligned to 64 bytes, so that they can be used directly from a memory mapped file.
+"""
+
+import io
+import json
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b"SFSNAP01"
+ALIGNMENT = 64
+
+# the version of the values and columns which are stored by the tracker
+VERSION = 1
+
+def _align(offset): 
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_snapshot(file, values, columns): 
+    """
+    Writes the JSON-serializable values and the dict of column arrays to a binary file object
+    """
+    columns = {name: np.ascontiguousarray(column) for name, column in columns.items()}
+
+    # the offsets of the columns are relative to the start of the data section
+    layout = []
+    offset = 0
+    for name, column in columns.items(): 
+        layout.append({"name": name, "dtype": column.dtype.str, "shape": list(column.shape), "offset": offset})
+        offset = _align(offset + column.nbytes)
+
+    header = json.dumps({"values": values, "columns": layout}).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    file.write(MAGIC)
+    file.write(struct.pack("<Q", len(header)))
+    file.write(header)
+    file.write(b"\0" * (data_start - len(MAGIC) - 8 - len(header)))
+
+    position = 0
+    for entry, column in zip(layout, columns.values()): 
+        file.write(b"\0" * (entry["offset"] - position))
+        file.write(column.data)
+        position = entry["offset"] + column.nbytes
+
+def read_snapshot(source): 
+    """
+    Reads a snapshot from bytes or from a file path, which is memory mapped.
+    Returns the values and a dict of read-only column arrays, which are views to the snapshot.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)): 
+        buffer = source
+    else: 
+        with open(source, "rb") as f: 
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if bytes(buffer[:len(MAGIC)]) != MAGIC: 
+        raise ValueError("The data is not a tracker snapshot")
+
+    header_length = struct.unpack("<Q", bytes(buffer[len(MAGIC):len(MAGIC) + 8]))[0]
+    header = json.loads(bytes(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + header_length]).decode("utf-8"))
+    data_start = _align(len(MAGIC) + 8 + header_length)
+
+    columns = {}
+    for entry in header["columns"]: 
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        column = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + entry["offset"])
+        columns[entry["name"]] = column.reshape(entry["shape"])
+
+    return header["values"], columns
+
+def snapshot_bytes(values, columns): 
+    file = io.BytesIO()
+    write_snapshot(file, values, columns)
+
+    return file.getvalue()
@@ -0,0 +1,168 @@
+import numpy as np
+
+from .filter_bank import FilterBank
+
+def _resize(column, capacity, size): 
+    resized = np.zeros(capacity, dtype=column.dtype)
+    resized[:size] = column[:size]
+
+    return resized
+
+class TrackTable: 
+    """
+    Stores the tracked objects column-wise: the ids, the labels, the time to live and the birth status are kept in arrays,
+    the filter states in a FilterBank, whose strategy is shared by all tracks.
+    A removed row is reused by moving the last row into its place.
+
+    The rows are indexed by id, and the ids of the born tracks are kept in a set, which is updated 
+    when tracks are added, born or removed. 
+    """
+
+    def __init__(self, strategy, history_size=10, capacity=16, dtype=float): 
+        self.filters = FilterBank(strategy, history_size=history_size, capacity=capacity, dtype=dtype)
+
+        self.__capacity = capacity
+        self.__size = 0
+        self.__ids = np.zeros(capacity, dtype=np.int64)
+        self.__labels = np.zeros(capacity, dtype=np.int64)
+        self.__time_to_live = np.zeros(capacity, dtype=int)
+        self.__is_born = np.zeros(capacity, dtype=bool)
+
+        # maps the id to the row of a track
+        self.__rows = {}
+        self.__born_ids = set()
+
+    def __len__(self): 
+        return self.__size
+
+    @property
+    def ids(self): 
+        return self.__ids[:self.__size]
+
+    @property
+    def labels(self): 
+        return self.__labels[:self.__size]
+
+    @property
+    def time_to_live(self): 
+        return self.__time_to_live[:self.__size]
+
+    @property
+    def is_born(self): 
+        return self.__is_born[:self.__size]
+
+    @property
+    def born_ids(self): 
+        """
+        The set of the ids of the born tracks, which must not be changed
+        """
+        return self.__born_ids
+
+    def __contains__(self, id): 
+        return id in self.__rows
+
+    def row(self, id): 
+        return self.__rows[id]
+
+    def bear(self, rows): 
+        """
+        Marks the tracks in the given rows as born
+        """
+        self.__is_born[rows] = True
+        self.__born_ids.update(self.__ids[rows].tolist())
+
+    def add(self, id, state, time_to_live, is_born, label=0): 
+        if self.__size == self.__capacity: 
+            self.__grow()
+
+        row = self.filters.add(state)
+        self.__ids[row] = id
+        self.__labels[row] = label
+        self.__time_to_live[row] = time_to_live
+        self.__is_born[row] = is_born
+        self.__rows[id] = row
+        self.__size += 1
+
+        if is_born: 
+            self.__born_ids.add(id)
+
+        return row
+
+    def remove(self, row): 
+        """
+        Removes the track in the given row, the last track takes its place
+        """
+        id = int(self.__ids[row])
+        del self.__rows[id]
+        self.__born_ids.discard(id)
+
+        last = self.__size - 1
+        if row != last: 
+            self.__ids[row] = self.__ids[last]
+            self.__labels[row] = self.__labels[last]
+            self.__time_to_live[row] = self.__time_to_live[last]
+            self.__is_born[row] = self.__is_born[last]
+            self.__rows[self.__ids[row]] = row
+
+        self.filters.remove(row)
+        self.__size -= 1
+
+    def restore(self, ids, time_to_live, is_born, histories, lengths, row_states=None, labels=None): 
+        """
+        Replaces all tracks by the given columns, all tracks get the label 0 if no labels are given
+        """
+        self.filters.set_histories(histories, lengths, row_states)
+
+        self.__size = len(ids)
+        self.__capacity = max(self.__capacity, self.__size)
+        self.__ids = _resize(np.asarray(ids, dtype=np.int64), self.__capacity, self.__size)
+        self.__labels = _resize(np.zeros(self.__size, dtype=np.int64) if labels is None else np.asarray(labels, dtype=np.int64), self.__capacity, self.__size)
+        self.__time_to_live = _resize(np.asarray(time_to_live, dtype=int), self.__capacity, self.__size)
+        self.__is_born = _resize(np.asarray(is_born, dtype=bool), self.__capacity, self.__size)
+        self.__rows = {id: row for row, id in enumerate(self.ids.tolist())}
+        self.__born_ids = set(self.ids[self.is_born].tolist())
+
+    def __grow(self): 
+        self.__capacity *= 2
+
+        self.__ids = _resize(self.__ids, self.__capacity, self.__size)
+        self.__labels = _resize(self.__labels, self.__capacity, self.__size)
+        self.__time_to_live = _resize(self.__time_to_live, self.__capacity, self.__size)
+        self.__is_born = _resize(self.__is_born, self.__capacity, self.__size)
+
+class TrackView: 
+    """
+    Lightweight handle to a tracked object, which acts like a filter
+    """
+
+    __slots__ = ("id", "__table")
+
+    def __init__(self, table, id): 
+        self.id = id
+        self.__table = table
+
+    @property
+    def time_to_live(self): 
+        return int(self.__table.time_to_live[self.__table.row(self.id)])
+
+    @property
+    def label(self): 
+        return int(self.__table.labels[self.__table.row(self.id)])
+
+    @property
+    def is_born(self): 
+        return bool(self.__table.is_born[self.__table.row(self.id)])
+
+    def eval(self, time=0): 
+        return self.__table.filters.eval_row(self.__table.row(self.id), time=time)
+
+    def eval_horizons(self, times): 
+        return self.__table.filters.eval_row_horizons(self.__table.row(self.id), times)
+
+    def raw(self, time=0): 
+        # we center the time around the latest sample, which will be T=0
+        history = self.get_history()
+        return history[history.shape[0] + time - 1].copy()
+
+    def get_history(self): 
+        return self.__table.filters.get_history(self.__table.row(self.id))
\ No newline at end of file
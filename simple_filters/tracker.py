@@ -1,9 +1,13 @@
 import numpy as np
 from copy import deepcopy
 
-from scipy.optimize import linear_sum_assignment
-
 from . import Filter
+from .assignment import SOLVERS, sparse_assignment, euclidean_candidates, matrix_candidates
+from .distance import euclidean_distance, predicted_mahalanobis_distance
+from .track_table import TrackTable, TrackView
+from .tracker_stats import UpdateStats
+from .tracker_events import TrackEvents
+from .snapshot import VERSION, read_snapshot, write_snapshot, snapshot_bytes
 
 class TrackedObject(Filter): 
     """
@@ -37,6 +41,9 @@ class TrackedObject(Filter):
     def eval(self, time=0): 
         return self.filter.eval(time=time)
 
+    def eval_horizons(self, times): 
+        return self.filter.eval_horizons(times)
+
     def raw(self, time=0): 
         return self.filter.raw(time=time)
 
@@ -52,115 +59,543 @@ class Tracker:
                     max_time_to_live=1, 
                     time_to_birth=1,
                     distance_threshold=1.0, 
-                    distance_function=lambda x1, x2: np.linalg.norm(x1 - x2)): 
+                    distance_function=None, 
+                    pairwise_distance_function=None, 
+                    gating=False, 
+                    assignment="hungarian", 
+                    class_parameters=None, 
+                    collect_stats=False, 
+                    stats_callback=None, 
+                    collect_events=False, 
+                    event_callback=None): 
+        """
+        The distance can either be given as a pairwise_distance_function, which maps the predicted states (T, D) 
+        and the new states (S, D) to a (T, S) distance matrix, or as a distance_function, which is called for every 
+        pair of arrays. Without any of both, the euclidean distance is used. 
+
+        With gating enabled, only pairs within the distance threshold are considered for matching and each connected 
+        group of candidates is matched separately. For the euclidean distance, the candidates are found with a k-d tree. 
+
+        Without gating, the assignment solver matches the distance matrix: "auto", "hungarian", "auction", "greedy" 
+        or a function which maps the distance matrix and the threshold to the matched object and state indices. 
+        The default is the optimal matching of the full distance matrix. "auto" chooses the solver by the size and the 
+        sparsity of the problem and only matches pairs within the threshold, like gating, so its results can differ. 
+
+        If update is called with a label per state, e.g. the class of a detection, objects are only matched to states 
+        with the same label and one assignment problem is solved per label. The class_parameters optionally map a label 
+        to a dict with its own distance_threshold, max_time_to_live and time_to_birth. 
+
+        With collect_stats enabled, the UpdateStats of the latest update are available as last_stats. 
+        A stats_callback is called with the UpdateStats after every update, which also enables the collection. 
+
+        With collect_events enabled, update returns the TrackEvents with the ids of the born, matched, coasted and 
+        removed objects, which are also available as last_events. An event_callback is called with the TrackEvents 
+        after every update, which also enables the collection. 
+        """
+        if pairwise_distance_function is None and distance_function is None: 
+            pairwise_distance_function = euclidean_distance
+
         self.distance_threshold = distance_threshold
         self.max_time_to_live = max_time_to_live
         self.time_to_birth = time_to_birth
+        self.gating = gating
+
+        self.class_parameters = class_parameters or {}
+        for parameters in self.class_parameters.values(): 
+            unknown = set(parameters) - {"distance_threshold", "max_time_to_live", "time_to_birth"}
+            if unknown: 
+                raise ValueError("Unknown class parameters: %s" % ", ".join(sorted(unknown)))
+
+        if callable(assignment): 
+            self.__assignment = assignment
+        elif assignment in SOLVERS: 
+            self.__assignment = SOLVERS[assignment]
+        else: 
+            raise ValueError("Unknown assignment solver: %s" % assignment)
 
         self.object_counter = 0
 
+        self.collect_stats = collect_stats
+        self.stats_callback = stats_callback
+        self.last_stats = None
+
+        self.collect_events = collect_events
+        self.event_callback = event_callback
+        self.last_events = None
+
         self.__distance_function = distance_function
-        self.__filter_prototype = filter_prototype
-        self.__tracked_objects = []
+        self.__pairwise_distance_function = pairwise_distance_function
+
+        # the strategy and the dtype of the prototype are shared by all tracks
+        self.dtype = filter_prototype.dtype
+        self.__tracks = TrackTable(deepcopy(filter_prototype.strategy), history_size=filter_prototype.history_size, dtype=self.dtype)
+
+    @property
+    def cache_hits(self): 
+        """
+        The number of evaluations of the tracked objects, which have been answered from the cache
+        """
+        return self.__tracks.filters.cache_hits
+
+    @property
+    def cache_misses(self): 
+        return self.__tracks.filters.cache_misses
 
     def get_tracked_objects(self): 
-        return list(filter(lambda x: x.is_born, self.__tracked_objects))
+        return [TrackView(self.__tracks, id) for id in sorted(self.__tracks.born_ids)]
 
-    def to_numpy_array(self, raw=False): 
+    def get_tracked_object(self, id): 
+        """
+        Returns the born object with the given id, or None if there is none
+        """
+        return TrackView(self.__tracks, id) if id in self.__tracks.born_ids else None
+
+    def to_numpy_array(self, raw=False, out=None): 
         """
         Returns the tracking id, plus the filtered object state if raw is False
+
+        The result can be written to a preallocated array out with the shape (capacity, D + 1), which is 
+        returned as a view of its first N rows. This way, consumers can read from a stable buffer every frame. 
         """
-        m = []
-        for t in self.get_tracked_objects(): 
-            if raw: 
-                state = t.raw()
-            else: 
-                state = t.eval()
-            
-            m.append(np.insert(np.array(t.id, dtype=np.float32), 0, state))
+        rows = self.__born_rows()
+        if rows.size == 0: 
+            return np.array([]) if out is None else out[:0]
+
+        if raw: 
+            states = self.__tracks.filters.raw()
+        else: 
+            states = self.__tracks.filters.eval()
+
+        if out is None: 
+            out = np.empty((rows.size, states.shape[1] + 1), dtype=np.float32)
+        elif out.shape[0] < rows.size or out.shape[1:] != (states.shape[1] + 1,): 
+            raise ValueError("The output array with the shape %s cannot hold %d objects of dimension %d" % (out.shape, rows.size, states.shape[1]))
+
+        m = out[:rows.size]
+        m[:, :-1] = states[rows]
+        m[:, -1] = self.__tracks.ids[rows]
+
+        return m
+
+    def get_ids(self): 
+        """
+        Returns the ids of the born objects (N,) as integers, in the order of get_tracked_objects and to_numpy_array. 
+        Unlike the last column of to_numpy_array, they are exact for ids beyond the precision of float32.
+        """
+        return self.__tracks.ids[self.__born_rows()]
+
+    def get_labels(self): 
+        """
+        Returns the labels of the born objects (N,), in the order of get_tracked_objects and to_numpy_array
+        """
+        return self.__tracks.labels[self.__born_rows()]
+
+    def eval_horizons(self, times): 
+        """
+        Predicts the states of all born objects at several times, e.g. a trajectory with times=range(1, 31). 
+        Returns an (N, H, D) array in the order of get_tracked_objects.
+        """
+        return self.__tracks.filters.eval_horizons(times)[self.__born_rows()]
+
+    def coast(self, steps=1): 
+        """
+        Advances all objects with their predicted state, without changing their time to live, 
+        e.g. when a frame has been dropped
+        """
+        for _ in range(0, steps): 
+            if len(self.__tracks) > 0: 
+                self.__tracks.filters.update(self.__tracks.filters.eval(time=1), np.zeros(len(self.__tracks), dtype=bool))
+
+    def snapshot(self, file=None): 
+        """
+        Stores the state of all tracked objects in a compact binary format, i.e. their ids, time to live, 
+        birth status and histories, as well as the object counter. The snapshot is written to the binary 
+        file object if given, otherwise it is returned as bytes. 
+        """
+        values = {"version": VERSION, "object_counter": self.object_counter, "history_size": self.__tracks.filters.history_size}
+        columns = self.__columns()
+
+        if file is None: 
+            return snapshot_bytes(values, columns)
+
+        write_snapshot(file, values, columns)
+
+    def restore(self, snapshot): 
+        """
+        Replaces all tracked objects by the ones of a snapshot, which is given as bytes or as a file path. 
+        Files are memory mapped, so that only the columns are read. The parameters of the tracker, 
+        including the filter, are not part of the snapshot and must match the ones of the stored tracker. 
+        """
+        values, columns = read_snapshot(snapshot)
+        if values.get("version") != VERSION: 
+            raise ValueError("The snapshot has the version %s instead of %d" % (values.get("version"), VERSION))
+
+        if values["history_size"] != self.__tracks.filters.history_size: 
+            raise ValueError("The snapshot has the history size %d instead of %d" % (values["history_size"], self.__tracks.filters.history_size))
+
+        self.__restore_columns(columns)
+        self.object_counter = values["object_counter"]
+
+    def predict(self, time=1): 
+        """
+        Returns the ids (N,) and the predicted states (N, D) of all objects, including the ones which have not been born
+        """
+        if len(self.__tracks) == 0: 
+            return self.__tracks.ids.copy(), None
 
-        return np.array(m)
+        return self.__tracks.ids.copy(), self.__tracks.filters.eval(time=time)
 
-    def update(self, states):
+    def extract_tracks(self, ids): 
+        """
+        Removes the objects with the given ids and returns their columns, as they are stored in a snapshot, 
+        e.g. to hand them over to another tracker with insert_tracks
+        """
+        rows = np.array([self.__tracks.row(id) for id in np.asarray(ids).tolist()], dtype=int)
+        columns = self.__columns(rows)
+
+        # the rows are removed in descending order, so that the last row which takes the place of a removed one is retained
+        for row in np.sort(rows)[::-1]: 
+            self.__tracks.remove(row)
+
+        return columns
+
+    def insert_tracks(self, columns): 
+        """
+        Adds the objects of extract_tracks, whose ids must not be in use by this tracker
+        """
+        if len(self.__tracks) > 0: 
+            current = self.__columns()
+            columns = {name: np.concatenate([current[name], columns[name]]) for name in current}
+
+        self.__restore_columns(columns)
+        self.object_counter = max(self.object_counter, int(self.__tracks.ids.max(initial=0)))
+
+    def match(self, states, labels=None, candidates=False): 
+        """
+        Matches the objects to the new states like update, without changing the tracker. 
+        Returns the ids of the matched objects, the indices of their states and their distances. 
+        If candidates is True, all pairs within the distance threshold of their label are returned 
+        as well, in the same format, i.e. a tuple (matches, candidates). 
+        """
+        states = np.asarray(states, dtype=self.dtype)
+        if len(states.shape) == 1: 
+            states = states[np.newaxis]
+
+        if len(self.__tracks) == 0 or states.size == 0: 
+            empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=int), np.empty(0))
+            return (empty, empty) if candidates else empty
+
+        labels = np.zeros(states.shape[0], dtype=np.int64) if labels is None else np.asarray(labels, dtype=np.int64).reshape(-1)
+        collected = [] if candidates else None
+        object_indices, state_indices, distances = self.__assign(self.__tracks.filters.eval(time=1), states, labels, None, collected)
+
+        matches = (self.__tracks.ids[object_indices], state_indices, distances)
+        if not candidates: 
+            return matches
+
+        if len(collected) == 0: 
+            return matches, (np.empty(0, dtype=np.int64), np.empty(0, dtype=int), np.empty(0))
+
+        object_indices, state_indices, distances = (np.concatenate(column) for column in zip(*collected))
+        return matches, (self.__tracks.ids[object_indices], state_indices, distances)
+
+    def update(self, states, labels=None, matches=None, new_ids=None): 
         """
         Updates the list of tracked objects by mapping the closest objects to the new states. 
         Objects which cannot be mapped are either added or removed. 
+        Optionally, the labels (N,) assign an integer label to each state, otherwise all states have the label 0. 
+        Returns the TrackEvents of the update if they are collected, otherwise None. 
+
+        Instead of matching, the matches can be given as the ids of the objects and the indices of their states, 
+        e.g. the result of match. The unmatched states get the new_ids if given, otherwise the next free ids. 
+
+        The states are not copied if they are given as an (N, D) array of the tracker's dtype, 
+        e.g. a preallocated buffer. They are only read during the update and can be reused afterwards. 
         """
+        stats = UpdateStats() if self.collect_stats or self.stats_callback is not None else None
+        events = TrackEvents() if self.collect_events or self.event_callback is not None else None
 
-        states = np.array(states)
+        states = np.asarray(states, dtype=self.dtype)
 
         # check if the states array is 2d, otherwise make it so
         if len(states.shape) == 1: 
-            states = np.array([states])
+            states = states[np.newaxis]
 
         # check if the states array is empty
         if states.size == 0: 
             number_of_states = 0
         else: 
             number_of_states = states.shape[0]
+
+        if labels is None: 
+            labels = np.zeros(number_of_states, dtype=np.int64)
+        else: 
+            labels = np.asarray(labels, dtype=np.int64).reshape(-1)
+            if labels.shape[0] != number_of_states: 
+                raise ValueError("%d labels have been given for %d states" % (labels.shape[0], number_of_states))
         
-        number_of_tracked_objects = len(self.__tracked_objects)
-        objects_to_match = list([i for i in range(0, number_of_tracked_objects)])
-        states_to_match = list([i for i in range(0, number_of_states)])
+        number_of_tracked_objects = len(self.__tracks)
+        objects_matched = np.zeros(number_of_tracked_objects, dtype=bool)
+        states_matched = np.zeros(number_of_states, dtype=bool)
+
+        if number_of_tracked_objects > 0: 
+            # get the predicted states of all objects, the returned copy is updated with the matched states below
+            predictions = self.__tracks.filters.eval(time=1)
+
+        if stats is not None: 
+            stats.matrix_shape = (number_of_tracked_objects, number_of_states)
+            stats.lap("predict")
 
         ## Build the distance matrix and match objects
         # We build a matrix that contains the distances of the tracked objects 
         # with its predicted state (determined by the filter) and the new states which just came in
         if number_of_tracked_objects > 0 and number_of_states > 0: 
+            if matches is None: 
+                object_indices, state_indices, _ = self.__assign(predictions, states, labels, stats)
+            else: 
+                object_indices = np.array([self.__tracks.row(id) for id in np.asarray(matches[0]).tolist()], dtype=int)
+                state_indices = np.asarray(matches[1], dtype=int)
 
-            # Calculate the distance matrix, the complexity is n^2
-            distance_matrix = np.zeros((number_of_tracked_objects, number_of_states))
-            for t, tracked_object in enumerate(self.__tracked_objects):
-                # get the predicted state of this object
-                pred_state = tracked_object.eval(time=1)
+            objects_matched[object_indices] = True
+            states_matched[state_indices] = True
 
-                for s in range(0, number_of_states): 
-                    state = states[s, :]
-                    distance_matrix[t, s] = self.__distance_function(pred_state, state)
+            # the matched objects are updated with their new state
+            predictions[object_indices] = states[state_indices]
 
-            # Now we match the tracked objects to the objects in the distance matrix 
-            # We do this by applying minimum weight matching in bipartite graphs: 
-            # https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.linear_sum_assignment.html 
-            object_indices, state_indices = linear_sum_assignment(distance_matrix)
-
-            for (t, s) in zip(object_indices, state_indices): 
-                d = distance_matrix[t, s]
-                
-                if d > self.distance_threshold: 
-                    continue
-
-                objects_to_match.remove(t)
-                states_to_match.remove(s)
-                self.__tracked_objects[t].increase_time_to_live()
-                self.__tracked_objects[t].update(states[s])
-
-        ## Delete objects
-        # Remove an object that has not been seen when its time-to-live is exceeded
-        # We are using two steps for deletion, because in the first step we are addressing by index and we 
-        # don't want to mess up the list indexing
-        removals = []
-        for i in objects_to_match: 
-            tracked_object = self.__tracked_objects[i]
-            tracked_object.decrease_time_to_live()
-
-            if tracked_object.time_to_live < 1: 
-                removals.append(tracked_object)
-            else:  
-                # update the object with the next predicted state
-                tracked_object.update(tracked_object.eval(time=1))
-
-        for tracked_object in removals: 
-            self.__tracked_objects.remove(tracked_object)
+        if number_of_tracked_objects > 0: 
+            time_to_live = self.__tracks.time_to_live
+            is_born = self.__tracks.is_born
+
+            # matched objects gain time to live until the maximum, and may be born
+            increase = objects_matched & (time_to_live < self.__class_values("max_time_to_live", self.__tracks.labels))
+            time_to_live[increase] += 1
+            born = objects_matched & (self.__class_values("time_to_birth", self.__tracks.labels) <= time_to_live)
+
+            newly_born = born & ~is_born
+
+            if stats is not None: 
+                stats.matched = int(np.count_nonzero(objects_matched))
+                stats.coasted = number_of_tracked_objects - stats.matched
+                stats.born = int(np.count_nonzero(newly_born))
+
+            if events is not None: 
+                ids = self.__tracks.ids
+                events.born = ids[newly_born]
+                events.matched = ids[objects_matched & is_born]
+                events.coasted = ids[~objects_matched & is_born]
+
+            self.__tracks.bear(np.flatnonzero(newly_born))
+
+            # objects which have not been seen lose time to live
+            decrease = ~objects_matched & (time_to_live > 0)
+            time_to_live[decrease] -= 1
+
+            # objects that have not been seen are updated with their predicted state, which is not a measurement
+            self.__tracks.filters.update(predictions, objects_matched)
+
+            if stats is not None: 
+                stats.lap("update")
+
+            ## Delete objects
+            # Remove an object that has not been seen when its time-to-live is exceeded
+            # The rows are removed in descending order, so that the last row which takes the place of a removed one is retained
+            if events is not None: 
+                events.removed = self.__tracks.ids[(time_to_live < 1) & is_born]
+
+            removed_rows = np.flatnonzero(time_to_live < 1)[::-1]
+
+            for row in removed_rows: 
+                self.__tracks.remove(row)
+
+            if stats is not None: 
+                stats.removed = removed_rows.size
+                stats.lap("remove")
 
         ## Add objects
         # now go through all unmatched objects and create new objects
-        for i in states_to_match: 
-            self.object_counter += 1
-            added_object = TrackedObject(
-                                self.object_counter, 
-                                deepcopy(self.__filter_prototype), 
-                                max_time_to_live=self.max_time_to_live,
-                                time_to_birth=self.time_to_birth
-                            )
-            added_object.update(states[i])
-            self.__tracked_objects.append(added_object)
+        added_states = np.flatnonzero(~states_matched)
+        added_born = np.broadcast_to(self.__class_values("time_to_birth", labels[added_states]) <= 1, added_states.shape)
+        if new_ids is None: 
+            added_ids = np.arange(self.object_counter + 1, self.object_counter + 1 + added_states.size, dtype=np.int64)
+        else: 
+            added_ids = np.asarray(new_ids, dtype=np.int64).reshape(-1)
+            if added_ids.size != added_states.size: 
+                raise ValueError("%d new ids have been given for %d unmatched states" % (added_ids.size, added_states.size))
+
+        for i, id, is_added_born in zip(added_states.tolist(), added_ids.tolist(), added_born.tolist()): 
+            self.__tracks.add(id, states[i], 1, is_added_born, labels[i])
+            self.object_counter = max(self.object_counter, id)
+
+        if events is not None: 
+            if np.any(added_born): 
+                events.born = np.concatenate([events.born, added_ids[added_born]])
+
+            self.last_events = events
+
+            if self.event_callback is not None: 
+                self.event_callback(events)
+
+        if stats is not None: 
+            stats.added = added_states.size
+            stats.born += int(np.count_nonzero(added_born))
+
+            stats.lap("add")
+            self.last_stats = stats
+
+            if self.stats_callback is not None: 
+                self.stats_callback(stats)
+
+        return events
+
+    def __columns(self, rows=None): 
+        """
+        Returns the columns of all objects, or of the given rows, as they are stored in a snapshot
+        """
+        histories, lengths = self.__tracks.filters.get_histories()
+        columns = {
+            "ids": self.__tracks.ids, 
+            "labels": self.__tracks.labels, 
+            "time_to_live": self.__tracks.time_to_live, 
+            "is_born": self.__tracks.is_born, 
+            "lengths": lengths, 
+            "histories": histories, 
+        }
+
+        # the recursive states of the filters, if the strategy has any
+        for name, column in self.__tracks.filters.get_row_states().items(): 
+            columns["state." + name] = column
+
+        if rows is not None: 
+            columns = {name: column[rows] for name, column in columns.items()}
+
+        # the samples before the start of short histories are not initialized, they are stored as zeros
+        histories, lengths = columns["histories"], columns["lengths"]
+        is_valid = np.arange(histories.shape[1]) >= histories.shape[1] - lengths[:, np.newaxis]
+        columns["histories"] = np.where(is_valid.reshape(is_valid.shape + (1,) * (histories.ndim - 2)), histories, 0).astype(histories.dtype, copy=False)
+
+        return columns
+
+    def __restore_columns(self, columns): 
+        row_states = {name[len("state."):]: column for name, column in columns.items() if name.startswith("state.")}
+        self.__tracks.restore(columns["ids"], columns["time_to_live"], columns["is_born"], columns["histories"], columns["lengths"], row_states, columns.get("labels"))
+
+    def __assign(self, predictions, states, labels, stats, collected=None): 
+        """
+        Matches the predictions of all objects to the states, each label separately. 
+        Returns the rows of the matched objects, the indices of their states and their distances. 
+        The candidate pairs within the distance threshold are appended to the list collected, if given. 
+        """
+        matches = []
+        for label, rows, indices in self.__partitions(self.__tracks.labels, labels): 
+            candidates = [] if collected is not None else None
+            if rows is None: 
+                matches.append(self.__match(predictions, states, label, None, stats, candidates))
+                if candidates: 
+                    collected.append(candidates[0])
+            else: 
+                object_indices, state_indices, distances = self.__match(predictions[rows], states[indices], label, rows, stats, candidates)
+                matches.append((rows[object_indices], indices[state_indices], distances))
+                if candidates: 
+                    collected.append((rows[candidates[0][0]], indices[candidates[0][1]], candidates[0][2]))
+
+        if len(matches) == 0: 
+            return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)
+
+        return tuple(np.concatenate(column) for column in zip(*matches))
+
+    def __class_values(self, name, labels): 
+        """
+        Returns the value of the parameter for each label, or the value of the tracker if no class has its own
+        """
+        value = getattr(self, name)
+        if not any(name in parameters for parameters in self.class_parameters.values()): 
+            return value
+
+        values = np.full(labels.shape, value)
+        for label, parameters in self.class_parameters.items(): 
+            if name in parameters: 
+                values[labels == label] = parameters[name]
+
+        return values
+
+    def __partitions(self, object_labels, state_labels): 
+        """
+        Yields the label, the rows of the objects and the indices of the states of each label, which occurs in both. 
+        If all objects and states share one label, the rows and indices are None. 
+        """
+        first = object_labels[0]
+        if (object_labels == first).all() and (state_labels == first).all(): 
+            yield int(first), None, None
+            return
+
+        for label in np.intersect1d(object_labels, state_labels).tolist(): 
+            yield label, np.flatnonzero(object_labels == label), np.flatnonzero(state_labels == label)
+
+    def __match(self, predictions, states, label, rows, stats, collected=None): 
+        """
+        Matches the predictions of the objects in the given rows (all objects if None) to the states of the same label. 
+        Returns the indices of the matched predictions and states and their distances. 
+        The candidate pairs within the distance threshold are appended to the list collected, if given. 
+        """
+        distance_threshold = self.class_parameters.get(label, {}).get("distance_threshold", self.distance_threshold)
+
+        if self.gating: 
+            candidates = self.__gated_candidates(predictions, states, distance_threshold, rows)
+            if stats is not None: 
+                stats.lap("distance")
+
+            if collected is not None: 
+                collected.append(candidates)
+
+            object_indices, state_indices = sparse_assignment(*candidates, predictions.shape[0], states.shape[0])
+
+            # the distances of the matches are looked up in the candidates
+            keys = candidates[0].astype(np.int64) * states.shape[0] + candidates[1]
+            order = np.argsort(keys)
+            positions = order[np.searchsorted(keys[order], object_indices.astype(np.int64) * states.shape[0] + state_indices)]
+            distances = candidates[2][positions]
+        else: 
+            # Calculate the distance matrix, the complexity is n^2
+            distance_matrix = self.__calc_distance_matrix(predictions, states, rows)
+            if stats is not None: 
+                stats.lap("distance")
+
+            if collected is not None: 
+                collected.append(matrix_candidates(distance_matrix, distance_threshold))
+
+            # Now we match the tracked objects to the objects in the distance matrix 
+            # We do this by applying minimum weight matching in bipartite graphs, or an approximation of it
+            object_indices, state_indices = self.__assignment(distance_matrix, distance_threshold)
+            distances = distance_matrix[object_indices, state_indices]
+
+        if stats is not None: 
+            stats.lap("assignment")
+
+        return object_indices, state_indices, distances
+
+    def __gated_candidates(self, predictions, states, distance_threshold, rows): 
+        if self.__pairwise_distance_function is euclidean_distance: 
+            return euclidean_candidates(predictions, states, distance_threshold)
+        else: 
+            return matrix_candidates(self.__calc_distance_matrix(predictions, states, rows), distance_threshold)
+
+    def __calc_distance_matrix(self, predictions, states, rows): 
+        if self.__pairwise_distance_function is predicted_mahalanobis_distance: 
+            variances = self.__tracks.filters.eval_variance(time=1)
+            return predicted_mahalanobis_distance(predictions, states, variances if rows is None else variances[rows])
+
+        if self.__pairwise_distance_function is not None: 
+            return self.__pairwise_distance_function(predictions, states)
+
+        # fall back to calling the distance function for every pair
+        distance_matrix = np.zeros((predictions.shape[0], states.shape[0]))
+        for t in range(0, predictions.shape[0]): 
+            for s in range(0, states.shape[0]): 
+                distance_matrix[t, s] = self.__distance_function(predictions[t], states[s])
+
+        return distance_matrix
+
+    def __born_rows(self): 
+        # the rows of all born objects, ordered by their id and thereby by their creation
+        rows = np.flatnonzero(self.__tracks.is_born)
+        return rows[np.argsort(self.__tracks.ids[rows])]
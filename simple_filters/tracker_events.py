@@ -0,0 +1,30 @@
+"""
+The lifecycle events of the tracked objects, which allow consumers to follow the tracker incrementally.
+"""
+
+import numpy as np
+
+class TrackEvents: 
+    """
+    The ids of the born objects, which have changed in a single Tracker.update: 
+    * **born**: The objects which have been born, including new objects if the time to birth is 1.
+    * **matched**: The objects which have been matched to a new state, excluding the newly born ones.
+    * **coasted**: The objects which have not been matched and were updated with their prediction.
+    * **removed**: The objects which have been removed, as their time to live is exceeded. They are also coasted.
+
+    Objects which have not been born are not reported, as they are not visible in get_tracked_objects.
+    """
+
+    __slots__ = ("born", "matched", "coasted", "removed")
+
+    def __init__(self, born=None, matched=None, coasted=None, removed=None): 
+        empty = np.empty(0, dtype=np.int64)
+
+        self.born = empty if born is None else born
+        self.matched = empty if matched is None else matched
+        self.coasted = empty if coasted is None else coasted
+        self.removed = empty if removed is None else removed
+
+    def __repr__(self): 
+        return "TrackEvents(born=%s, matched=%s, coasted=%s, removed=%s)" % (
+            self.born.tolist(), self.matched.tolist(), self.coasted.tolist(), self.removed.tolist())
@@ -0,0 +1,231 @@
+"""
+Tracking of many independent streams (e.g. one per camera) on a pool of workers.
+"""
+
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+class TrackerPool: 
+    """
+    Owns one tracker per stream id, which is created with the tracker_factory on the first frame of the stream.
+    All streams are updated in parallel per tick, either on a thread pool (executor="thread"), as the heavy
+    NumPy and SciPy sections release the GIL, or on worker processes (executor="process"), which receive the
+    frames through shared memory. In the latter case, the tracker_factory must be picklable.
+
+    Each stream is updated once per tick and always by the same worker, so the order of the frames and the
+    object ids of the streams are independent of each other.
+    """
+
+    def __init__(self, tracker_factory, executor="thread", max_workers=None): 
+        if executor not in ["thread", "process"]: 
+            raise ValueError("Unknown executor: %s" % executor)
+
+        self.tracker_factory = tracker_factory
+        self.executor = executor
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+
+        self.__trackers = {}
+        self.__thread_pool = None
+        self.__workers = []
+        self.__stream_workers = {}
+
+    def __enter__(self): 
+        return self
+
+    def __exit__(self, *args): 
+        self.close()
+
+    def get_tracker(self, stream_id): 
+        """
+        Returns the tracker of the stream, which is only available for the thread executor
+        """
+        return self.__trackers[stream_id]
+
+    def update(self, frames, raw=False): 
+        """
+        Updates the trackers with a dict of stream id -> states and returns a dict of
+        stream id -> to_numpy_array of the corresponding tracker
+        """
+        if self.executor == "thread": 
+            return self.__update_threads(frames, raw)
+        else: 
+            return self.__update_processes(frames, raw)
+
+    def remove_stream(self, stream_id): 
+        if self.executor == "thread": 
+            self.__trackers.pop(stream_id, None)
+        elif stream_id in self.__stream_workers: 
+            self.__workers[self.__stream_workers.pop(stream_id)].remove(stream_id)
+
+    def close(self): 
+        if self.__thread_pool is not None: 
+            self.__thread_pool.shutdown()
+            self.__thread_pool = None
+
+        for worker in self.__workers: 
+            worker.close()
+
+        self.__workers = []
+        self.__stream_workers = {}
+
+    def __update_threads(self, frames, raw): 
+        if self.__thread_pool is None: 
+            self.__thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        for stream_id in frames: 
+            if stream_id not in self.__trackers: 
+                self.__trackers[stream_id] = self.tracker_factory()
+
+        futures = {
+            stream_id: self.__thread_pool.submit(_update_tracker, self.__trackers[stream_id], states, raw)
+            for stream_id, states in frames.items()
+        }
+
+        return {stream_id: future.result() for stream_id, future in futures.items()}
+
+    def __update_processes(self, frames, raw): 
+        if len(self.__workers) == 0: 
+            self.__workers = [_ProcessWorker(self.tracker_factory) for _ in range(0, self.max_workers)]
+
+        # streams are assigned to the workers in a round robin fashion and stay there
+        batches = [{} for _ in self.__workers]
+        for stream_id, states in frames.items(): 
+            if stream_id not in self.__stream_workers: 
+                self.__stream_workers[stream_id] = len(self.__stream_workers) % len(self.__workers)
+
+            batches[self.__stream_workers[stream_id]][stream_id] = states
+
+        for worker, batch in zip(self.__workers, batches): 
+            if len(batch) > 0: 
+                worker.send(batch, raw)
+
+        # the results of all workers are received, so that the connections stay in sync if one of them fails
+        results = {}
+        errors = []
+        for worker, batch in zip(self.__workers, batches): 
+            if len(batch) > 0: 
+                try: 
+                    results.update(worker.receive())
+                except Exception as e: 
+                    errors.append(e)
+
+        if len(errors) > 0: 
+            raise errors[0]
+
+        return results
+
+def _update_tracker(tracker, states, raw): 
+    tracker.update(states)
+    return tracker.to_numpy_array(raw=raw)
+
+class _ProcessWorker: 
+    """
+    A worker process with its own trackers, the frames are written to a shared memory block,
+    which is reused and only grown when needed
+    """
+
+    def __init__(self, tracker_factory): 
+        self.__connection, worker_connection = multiprocessing.Pipe()
+        self.__process = multiprocessing.Process(target=_worker_main, args=(worker_connection, tracker_factory), daemon=True)
+        self.__process.start()
+        self.__memory = None
+
+    def send(self, frames, raw): 
+        from multiprocessing import shared_memory
+
+        arrays = {stream_id: np.ascontiguousarray(states, dtype=float) for stream_id, states in frames.items()}
+        size = max(1, sum(states.nbytes for states in arrays.values()))
+
+        if self.__memory is None or self.__memory.size < size: 
+            self.__release_memory()
+            self.__memory = shared_memory.SharedMemory(create=True, size=2 * size)
+
+        layout = []
+        offset = 0
+        for stream_id, states in arrays.items(): 
+            np.ndarray(states.shape, dtype=states.dtype, buffer=self.__memory.buf, offset=offset)[...] = states
+            layout.append((stream_id, offset, states.shape))
+            offset += states.nbytes
+
+        self.__connection.send(("update", self.__memory.name, layout, raw))
+
+    def receive(self): 
+        result = self.__connection.recv()
+        if isinstance(result, Exception): 
+            raise result
+
+        return result
+
+    def remove(self, stream_id): 
+        self.__connection.send(("remove", stream_id))
+
+    def close(self): 
+        # the worker may have died already, the shared memory is released in any case
+        try: 
+            if self.__process.is_alive(): 
+                self.__connection.send(None)
+                self.__process.join()
+        except (BrokenPipeError, EOFError, OSError): 
+            self.__process.terminate()
+        finally: 
+            self.__connection.close()
+            self.__release_memory()
+
+    def __release_memory(self): 
+        if self.__memory is not None: 
+            self.__memory.close()
+            self.__memory.unlink()
+            self.__memory = None
+
+def _attach_shared_memory(name): 
+    from multiprocessing import resource_tracker, shared_memory
+
+    # the block is owned and unlinked by the pool, so the worker must not track it
+    try: 
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: 
+        memory = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+def _worker_main(connection, tracker_factory): 
+    trackers = {}
+    memory = None
+
+    while True: 
+        message = connection.recv()
+        if message is None: 
+            break
+
+        if message[0] == "remove": 
+            trackers.pop(message[1], None)
+            continue
+
+        _, name, layout, raw = message
+        if memory is None or memory.name != name: 
+            if memory is not None: 
+                memory.close()
+
+            memory = _attach_shared_memory(name)
+
+        results = {}
+        try: 
+            for stream_id, offset, shape in layout: 
+                if stream_id not in trackers: 
+                    trackers[stream_id] = tracker_factory()
+
+                # the tracker copies the states, so the shared memory can be reused afterwards
+                states = np.ndarray(shape, dtype=float, buffer=memory.buf, offset=offset)
+                results[stream_id] = _update_tracker(trackers[stream_id], states, raw)
+                del states
+        except Exception as e: 
+            # the exception is raised in the pool
+            connection.send(e)
+            continue
+
+        connection.send(results)
+
+    if memory is not None: 
+        memory.close()
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Instrumentation of the tracker, which records what happened in each update.
+"""
+
+from time import perf_counter
+
+class UpdateStats: 
+    """
+    The durations in seconds of the stages of a single Tracker.update:
+    * **predict**: Evaluating the predicted states of the tracked objects.
+    * **distance**: Calculating the distance matrix, or the candidates with gating.
+    * **assignment**: Matching the tracked objects to the new states.
+    * **update**: Updating the time to live and the filters.
+    * **remove**: Removing the objects whose time to live is exceeded.
+    * **add**: Adding the unmatched states as new objects.
+
+    Furthermore, the number of matched, coasted (i.e. not matched), removed, added and newly born objects,
+    as well as the shape of the assignment problem (tracked objects, states).
+    """
+
+    STAGES = ("predict", "distance", "assignment", "update", "remove", "add")
+
+    __slots__ = ("durations", "matched", "coasted", "removed", "added", "born", "matrix_shape", "__last")
+
+    def __init__(self): 
+        self.durations = dict.fromkeys(self.STAGES, 0.0)
+        self.matched = 0
+        self.coasted = 0
+        self.removed = 0
+        self.added = 0
+        self.born = 0
+        self.matrix_shape = (0, 0)
+
+        self.__last = perf_counter()
+
+    @property
+    def total(self): 
+        return sum(self.durations.values())
+
+    def lap(self, stage): 
+        """
+        Assigns the time since the last lap to the stage
+        """
+        now = perf_counter()
+        self.durations[stage] += now - self.__last
+        self.__last = now
+
+    def __repr__(self): 
+        durations = ", ".join("%s=%.3fms" % (stage, duration * 1e3) for stage, duration in self.durations.items())
+        return "UpdateStats(%s, matched=%d, coasted=%d, removed=%d, added=%d, born=%d, matrix_shape=%s)" % (
+            durations, self.matched, self.coasted, self.removed, self.added, self.born, self.matrix_shape)
@@ -0,0 +1,118 @@
+from unittest import TestCase
+import os
+import subprocess
+import sys
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, DummyFilterStrategy
+from ..simple_filters.assignment import dense_assignment, sparse_assignment, euclidean_candidates, matrix_candidates, \
+    greedy_assignment, auction_assignment, auto_assignment
+from ..simple_filters.distance import euclidean_distance
+
+import pytest
+
+class TestAssignment(TestCase): 
+
+    def test_sparse_assignment(self): 
+        # objects on a grid, which are slightly displaced
+        rng = np.random.RandomState(0)
+        predictions = np.array([[x, y] for x in range(0, 20) for y in range(0, 20)], dtype=float) * 5
+        states = predictions[rng.permutation(predictions.shape[0])[:300]] + rng.rand(300, 2) - 0.5
+
+        expected = dense_assignment(euclidean_distance(predictions, states), 1.0)
+        candidates = euclidean_candidates(predictions, states, 1.0)
+        result = sparse_assignment(*candidates, predictions.shape[0], states.shape[0])
+
+        self.assertEqual(set(zip(*expected)), set(zip(*result)))
+
+    def test_sparse_assignment_component(self): 
+        # two objects compete for two states, the sum of the distances must be minimized
+        distance_matrix = np.array([[0.1, 0.5], [0.2, 2.0]])
+        objects, states = sparse_assignment(*matrix_candidates(distance_matrix, 1.0), 2, 2)
+
+        self.assertEqual(set(zip(objects, states)), {(0, 1), (1, 0)})
+
+    def test_tracker_gating(self): 
+        filter_prototype = Filter(DummyFilterStrategy(), history_size=5)
+        tracker = Tracker(filter_prototype, distance_threshold=1.0, gating=True)
+
+        tracker.update([[1.0, 1.0], [5.0, 5.0], [9.0, 9.0]])
+        tracker.update([[5.2, 5.2], [20.0, 20.0], [1.2, 1.2]])
+
+        ids = tracker.to_numpy_array()[:, -1]
+        self.assertEqual(tracker.object_counter, 4)
+        self.assertEqual(sorted(ids), [1, 2, 4])
+
+    def test_solvers(self): 
+        rng = np.random.RandomState(0)
+        for _ in range(0, 200): 
+            distance_matrix = rng.rand(*rng.randint(1, 12, size=2)) * 3
+            expected_objects, expected_states = dense_assignment(np.minimum(distance_matrix, 11.0), 10.0)
+            expected = distance_matrix[expected_objects, expected_states].sum()
+
+            for solver in [auction_assignment, auto_assignment]: 
+                objects, states = solver(distance_matrix, 10.0)
+
+                self.assertEqual(len(set(objects)), len(expected_objects))
+                self.assertEqual(len(set(states)), len(expected_states))
+                self.assertAlmostEqual(distance_matrix[objects, states].sum(), expected, places=6)
+
+    def test_solvers_threshold(self): 
+        distance_matrix = np.array([[0.5, 3.0, 3.0], [3.0, 3.0, 0.2]])
+
+        for solver in [dense_assignment, auction_assignment, greedy_assignment, auto_assignment]: 
+            objects, states = solver(distance_matrix, 1.0)
+            self.assertEqual(set(zip(objects, states)), {(0, 0), (1, 2)})
+
+    def test_auction_clipped(self): 
+        # all entries are beyond the threshold, so nothing is matched
+        objects, states = auction_assignment(np.full((2, 2), 5.), 1.0)
+        self.assertEqual((objects.size, states.size), (0, 0))
+
+        # all entries are equal and within the threshold
+        objects, states = auction_assignment(np.zeros((3, 4)), 1.0)
+        self.assertEqual((len(set(objects)), len(set(states))), (3, 3))
+
+    def test_tracker_auction_out_of_range(self): 
+        tracker = Tracker(Filter(DummyFilterStrategy(), history_size=5), distance_threshold=1.0, assignment="auction")
+
+        tracker.update([[1.0, 1.0], [5.0, 5.0]])
+        tracker.update([[50.0, 50.0], [90.0, 90.0]])
+        self.assertEqual(tracker.object_counter, 4)
+
+    def test_greedy_assignment(self): 
+        # the closest pair is matched first, although the total distance is higher
+        distance_matrix = np.array([[0.1, 0.5], [0.2, 2.0]])
+        objects, states = greedy_assignment(distance_matrix, 1.0)
+
+        self.assertEqual(set(zip(objects, states)), {(0, 0)})
+
+    def test_tracker_assignment(self): 
+        for assignment in ["auto", "hungarian", "auction", "greedy", dense_assignment]: 
+            tracker = Tracker(Filter(DummyFilterStrategy(), history_size=5), distance_threshold=1.0, assignment=assignment)
+
+            tracker.update([[1.0, 1.0], [5.0, 5.0], [9.0, 9.0]])
+            tracker.update([[5.2, 5.2], [20.0, 20.0], [1.2, 1.2]])
+
+            ids = tracker.to_numpy_array()[:, -1]
+            self.assertEqual(sorted(ids), [1, 2, 4])
+
+        with pytest.raises(ValueError): 
+            Tracker(Filter(DummyFilterStrategy()), assignment="unknown")
+
+    def test_lazy_scipy_import(self): 
+        package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = "import sys, simple_filters; assert 'scipy' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], cwd=package, check=True)
+
+    def test_tracker_default_assignment(self): 
+        # the default matches the full distance matrix like the hungarian solver
+        rng = np.random.RandomState(0)
+        trackers = [Tracker(Filter(DummyFilterStrategy(), history_size=5), distance_threshold=1.0, **parameters) for parameters in [{}, {"assignment": "hungarian"}]]
+
+        for _ in range(0, 20): 
+            states = rng.rand(8, 2) * 3.
+            for tracker in trackers: 
+                tracker.update(states)
+
+            self.assertTrue((trackers[0].to_numpy_array() == trackers[1].to_numpy_array()).all())
@@ -0,0 +1,139 @@
+from unittest import TestCase
+import asyncio
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, PolynomialFilterStrategy
+from ..simple_filters.async_tracker import AsyncTracker
+
+import pytest
+
+class Frames: 
+    """
+    Async iterable over the given frames, which are available immediately
+    """
+
+    def __init__(self, frames): 
+        self.frames = iter(frames)
+
+    def __aiter__(self): 
+        return self
+
+    async def __anext__(self): 
+        try: 
+            return next(self.frames)
+        except StopIteration: 
+            raise StopAsyncIteration
+
+class EndlessFrames: 
+    """
+    Async iterable over a static object, which yields to the event loop before each frame
+    """
+
+    def __aiter__(self): 
+        return self
+
+    async def __anext__(self): 
+        await asyncio.sleep(0)
+        return np.array([[0., 0.]])
+
+class TestAsyncTracker(TestCase): 
+
+    def setUp(self): 
+        strategy = PolynomialFilterStrategy(poly_degree=1, reject_outliers=False)
+        self.tracker = Tracker(Filter(strategy, history_size=5), distance_threshold=1.5, max_time_to_live=2)
+
+        # one object moving with constant speed
+        self.frames = [np.array([[float(i), 0.]]) for i in range(0, 10)]
+
+    def test_all_frames(self): 
+        async_tracker = AsyncTracker(self.tracker, max_pending_frames=len(self.frames))
+        results = self.run_tracker(async_tracker, self.frames)
+
+        self.assertEqual([frame_index for frame_index, _ in results], list(range(0, 10)))
+        self.assertEqual(async_tracker.dropped_frames, 0)
+
+    def test_drop_oldest(self): 
+        async_tracker = AsyncTracker(self.tracker, max_pending_frames=1, policy="drop_oldest")
+
+        # the first frames arrive at once, so only the latest one is kept
+        results = self.run_tracker(async_tracker, self.frames[:2] + self.frames[5:7])
+
+        self.assertEqual([frame_index for frame_index, _ in results], [3])
+        self.assertEqual(async_tracker.dropped_frames, 3)
+
+    def test_coast(self): 
+        # the object is tracked in every frame first, to determine its speed
+        self.run_tracker(AsyncTracker(self.tracker, max_pending_frames=5), self.frames[:5])
+
+        # the object keeps its id, as it is coasted over the dropped frames
+        async_tracker = AsyncTracker(self.tracker, max_pending_frames=1, policy="coast")
+        results = self.run_tracker(async_tracker, self.frames[5:])
+
+        self.assertEqual(async_tracker.dropped_frames, 4)
+        self.assertEqual(self.tracker.object_counter, 1)
+        self.assertTrue(np.allclose(results[-1][1], [[9., 0., 1.]]))
+
+    def test_latency_budget(self): 
+        async_tracker = AsyncTracker(self.tracker, latency_budget=-1., max_pending_frames=10)
+        results = self.run_tracker(async_tracker, self.frames)
+
+        self.assertEqual(results, [])
+        self.assertEqual(async_tracker.dropped_frames, 10)
+
+    def test_aclose(self): 
+        async def collect(): 
+            iterator = AsyncTracker(self.tracker).track(EndlessFrames())
+            results = []
+            for _ in range(0, 3): 
+                results.append(await iterator.__anext__())
+
+            await iterator.aclose()
+
+            # the reader of the frames has been cancelled
+            return results, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        loop = asyncio.new_event_loop()
+        try: 
+            results, tasks = loop.run_until_complete(collect())
+        finally: 
+            loop.close()
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(tasks, [])
+
+    def test_break(self): 
+        async def collect(): 
+            results = []
+            async for result in AsyncTracker(self.tracker).track(EndlessFrames()): 
+                results.append(result)
+                if len(results) == 3: 
+                    break
+
+            # the event loop closes the abandoned generator, which cancels the reader of the frames
+            for _ in range(0, 10): 
+                await asyncio.sleep(0)
+
+            return results, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        loop = asyncio.new_event_loop()
+        try: 
+            results, tasks = loop.run_until_complete(collect())
+        finally: 
+            loop.close()
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(tasks, [])
+
+    def run_tracker(self, async_tracker, frames): 
+        async def collect(): 
+            results = []
+            async for result in async_tracker.track(Frames(frames)): 
+                results.append(result)
+
+            return results
+
+        loop = asyncio.new_event_loop()
+        try: 
+            return loop.run_until_complete(collect())
+        finally: 
+            loop.close()
\ No newline at end of file
@@ -0,0 +1,43 @@
+from unittest import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+class TestBenchmarks(TestCase): 
+
+    def setUp(self): 
+        self.package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_baseline(self): 
+        report_file = os.path.join(self.directory.name, "report.json")
+        self.assertEqual(self.run_benchmarks("--output", report_file).returncode, 0)
+
+        with open(report_file, "r") as f: 
+            report = json.load(f)
+
+        self.assertEqual([result["name"] for result in report["results"]], ["filter.update(history_size=10,dimensions=2)"])
+
+        # a much faster baseline is a regression, a slower one or an unknown benchmark is not
+        for factor, name, returncode in [(0.01, None, 1), (100., None, 0), (0.01, "unknown", 0)]: 
+            baseline = json.loads(json.dumps(report))
+            for result in baseline["results"]: 
+                result["median_us"] *= factor
+                result["name"] = name or result["name"]
+
+            baseline_file = os.path.join(self.directory.name, "baseline.json")
+            with open(baseline_file, "w") as f: 
+                json.dump(baseline, f)
+
+            process = self.run_benchmarks("--baseline", baseline_file)
+            self.assertEqual(process.returncode, returncode)
+            self.assertEqual("REGRESSION" in process.stdout, returncode == 1)
+
+    def run_benchmarks(self, *args): 
+        command = [sys.executable, "-m", "benchmarks.run", "--quick", "--select", "filter.update(history_size=10,", "--repeat", "1"]
+        return subprocess.run(command + list(args), cwd=self.package, stdout=subprocess.PIPE, universal_newlines=True)
@@ -0,0 +1,46 @@
+from unittest import TestCase
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, DummyFilterStrategy, euclidean_distance, mahalanobis_diagonal_distance, iou_distance
+
+import pytest
+
+class TestDistance(TestCase): 
+
+    def test_euclidean_distance(self): 
+        predictions = np.random.rand(4, 3)
+        states = np.random.rand(5, 3)
+
+        distance_matrix = euclidean_distance(predictions, states)
+
+        self.assertEqual(distance_matrix.shape, (4, 5))
+        for t in range(0, 4): 
+            for s in range(0, 5): 
+                self.assertAlmostEqual(distance_matrix[t, s], np.linalg.norm(predictions[t] - states[s]))
+
+    def test_mahalanobis_diagonal_distance(self): 
+        distance_function = mahalanobis_diagonal_distance([4.0, 1.0])
+        distance_matrix = distance_function(np.array([[0.0, 0.0]]), np.array([[2.0, 0.0], [0.0, 2.0]]))
+
+        self.assertAlmostEqual(distance_matrix[0, 0], 1.0)
+        self.assertAlmostEqual(distance_matrix[0, 1], 2.0)
+
+    def test_iou_distance(self): 
+        predictions = np.array([[0.0, 0.0, 2.0, 2.0]])
+        states = np.array([[0.0, 0.0, 2.0, 2.0], [1.0, 0.0, 3.0, 2.0], [5.0, 5.0, 6.0, 6.0]])
+
+        distance_matrix = iou_distance(predictions, states)
+
+        self.assertAlmostEqual(distance_matrix[0, 0], 0.0)
+        self.assertAlmostEqual(distance_matrix[0, 1], 1.0 - 2.0 / 6.0)
+        self.assertAlmostEqual(distance_matrix[0, 2], 1.0)
+
+    def test_tracker_distance_function_fallback(self): 
+        filter_prototype = Filter(DummyFilterStrategy(), history_size=5)
+        tracker = Tracker(filter_prototype, distance_threshold=1.0, distance_function=lambda x1, x2: np.abs(x1 - x2).sum())
+
+        tracker.update([[1.0, 1.0], [5.0, 5.0]])
+        tracker.update([[5.2, 5.2], [1.2, 1.2]])
+
+        self.assertEqual(tracker.object_counter, 2)
+        self.assertTrue((tracker.to_numpy_array()[:, -1] == [1, 2]).all())
\ No newline at end of file
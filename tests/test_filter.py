@@ -1,6 +1,9 @@
 from unittest import TestCase
 
-from ..simple_filters import Filter, FilterStrategy, DummyFilterStrategy
+from ..simple_filters import Filter, FilterStrategy, DummyFilterStrategy, NumpyFilterStrategy, PolynomialFilterStrategy, RecursivePolynomialFilterStrategy, \
+    KalmanFilterStrategy
+
+import numpy as np
 
 import pytest
 
@@ -32,3 +35,159 @@ class TestFilter(TestCase):
         self.assertEqual(state[9], [19])
 
         assert(True)
+
+    def test_ring_buffer(self): 
+        strategy = DummyFilterStrategy()
+        filter = Filter(strategy, history_size=4)
+
+        states = np.arange(30, dtype=float).reshape(15, 2)
+        for i, state in enumerate(states): 
+            filter.update(state)
+
+            # the history must always be ordered chronologically
+            expected = states[max(0, i - 3):i + 1]
+            self.assertTrue((filter.get_history() == expected).all())
+            self.assertTrue((filter.raw() == state).all())
+
+    def test_ring_buffer_no_reallocation(self): 
+        strategy = DummyFilterStrategy()
+        filter = Filter(strategy, history_size=4)
+
+        filter.update([0., 0.])
+        first_history = filter.get_history()
+
+        for i in range(1, 10): 
+            filter.update([i, i])
+            self.assertTrue(np.shares_memory(first_history, filter.get_history()))
+
+    def test_results_are_copies(self): 
+        strategy = DummyFilterStrategy()
+        filter = Filter(strategy, history_size=3)
+
+        evals, raws = [], []
+        for i in range(6): 
+            filter.update([i])
+            evals.append(filter.eval())
+            raws.append(filter.raw())
+
+        # later updates must not overwrite the results of earlier ones
+        self.assertEqual(np.concatenate(evals).tolist(), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(np.concatenate(raws).tolist(), [0, 1, 2, 3, 4, 5])
+
+    def test_memoization(self): 
+        filter = Filter(PolynomialFilterStrategy(poly_degree=1), history_size=5)
+        for i in range(0, 5): 
+            filter.update([i, i])
+
+        result = filter.eval(time=1)
+        self.assertTrue(np.array_equal(filter.eval(time=1), result))
+        filter.eval(time=0)
+        self.assertEqual((filter.cache_hits, filter.cache_misses), (1, 2))
+
+        # the results are copies, changing them does not affect the cache, which is invalidated by the next update
+        result[0] = 0.
+        self.assertTrue(np.allclose(filter.eval(time=1), [5, 5]))
+        self.assertEqual((filter.cache_hits, filter.cache_misses), (2, 2))
+
+        filter.update([5, 5])
+        self.assertTrue(np.allclose(filter.eval(time=1), [6, 6]))
+        self.assertEqual((filter.cache_hits, filter.cache_misses), (2, 3))
+
+    def test_float32(self): 
+        strategies = [DummyFilterStrategy(), NumpyFilterStrategy(np.median), PolynomialFilterStrategy(poly_degree=2), RecursivePolynomialFilterStrategy(poly_degree=2)]
+
+        for strategy in strategies: 
+            filter = Filter(strategy, history_size=10, dtype=np.float32)
+            for i in range(0, 12): 
+                filter.update([i, 2 * i])
+
+            self.assertEqual(filter.get_history().dtype, np.float32)
+            self.assertEqual(filter.eval().dtype, np.float32)
+            self.assertEqual(filter.eval_horizons([1, 2]).dtype, np.float32)
+            self.assertEqual(filter.filter_series(np.ones((20, 2))).dtype, np.float32)
+
+    def test_filter_series(self): 
+        rng = np.random.RandomState(0)
+        series = np.cumsum(rng.randn(50, 3), axis=0)
+        series[::7] += 20.
+
+        for strategy_factory in [DummyFilterStrategy, lambda: NumpyFilterStrategy(np.median), lambda: PolynomialFilterStrategy(poly_degree=2)]: 
+            for time in [0, 1]: 
+                result = Filter(strategy_factory(), history_size=8).filter_series(series, time=time)
+
+                # the result must equal the streaming updates, including the warm-up
+                filter = Filter(strategy_factory(), history_size=8)
+                for state, filtered_state in zip(series, result): 
+                    filter.update(state)
+                    self.assertTrue(np.allclose(filter.eval(time=time), filtered_state, rtol=0, atol=1e-10))
+
+    def test_update_many(self): 
+        rng = np.random.RandomState(0)
+        series = np.cumsum(rng.randn(60, 2), axis=0)
+
+        strategy_factories = [
+            DummyFilterStrategy, 
+            lambda: NumpyFilterStrategy(np.mean), 
+            lambda: NumpyFilterStrategy(np.median), 
+            lambda: PolynomialFilterStrategy(poly_degree=2), 
+            lambda: RecursivePolynomialFilterStrategy(poly_degree=2), 
+            KalmanFilterStrategy, 
+        ]
+
+        for strategy_factory in strategy_factories: 
+            expected = Filter(strategy_factory(), history_size=8)
+            filter = Filter(strategy_factory(), history_size=8)
+
+            # chunks which are smaller and larger than the history, evaluated after some of them
+            start = 0
+            for i, size in enumerate([1, 3, 5, 12, 1, 1, 7, 20, 2, 8]): 
+                for state in series[start:start + size]: 
+                    expected.update(state)
+                filter.update_many(series[start:start + size])
+                start += size
+
+                self.assertEqual(filter.number_of_updates, expected.number_of_updates)
+                self.assertTrue((filter.get_history() == expected.get_history()).all())
+                if i % 2 == 1: 
+                    self.assertTrue(np.allclose(filter.eval(time=1), expected.eval(time=1)))
+
+            self.assertTrue(np.allclose(filter.eval_horizons([0, 2]), expected.eval_horizons([0, 2])))
+
+    def test_update_many_notifies_once(self): 
+        strategy = DummyFilterStrategy()
+        histories = []
+        strategy.update = histories.append
+
+        filter = Filter(strategy, history_size=4)
+        filter.update_many(np.arange(10, dtype=float).reshape(5, 2))
+
+        self.assertEqual(len(histories), 1)
+        self.assertTrue((histories[0] == np.arange(2, 10).reshape(4, 2)).all())
+
+    def test_update_many_kalman(self): 
+        rng = np.random.RandomState(0)
+        series = np.cumsum(rng.randn(40, 2), axis=0)
+
+        expected = Filter(KalmanFilterStrategy(), history_size=5)
+        filter = Filter(KalmanFilterStrategy(), history_size=5)
+        for start in range(0, 40, 4): 
+            for state in series[start:start + 4]: 
+                expected.update(state)
+            filter.update_many(series[start:start + 4])
+
+            self.assertTrue(np.allclose(filter.eval(time=1), expected.eval(time=1)))
+
+    def test_update_many_kalman_small_history(self): 
+        series = np.arange(40, dtype=float)[:, np.newaxis]
+
+        # the chunks are longer than the history, the recursive state must still see every sample
+        expected = Filter(KalmanFilterStrategy(), history_size=1)
+        filter = Filter(KalmanFilterStrategy(), history_size=1)
+        for start in range(0, 40, 4): 
+            for state in series[start:start + 4]: 
+                expected.update(state)
+            filter.update_many(series[start:start + 4])
+
+        self.assertTrue(np.allclose(filter.eval(time=1), expected.eval(time=1)))
+        self.assertTrue(np.allclose(filter.strategy.eval_variance(time=1), expected.strategy.eval_variance(time=1)))
+        self.assertAlmostEqual(filter.eval(time=1)[0], 40., delta=0.1)
@@ -0,0 +1,79 @@
+from unittest import TestCase
+import numpy as np
+
+from ..simple_filters import Filter, FilterBank, DummyFilterStrategy, NumpyFilterStrategy, PolynomialFilterStrategy
+
+import pytest
+
+class TestFilterBank(TestCase): 
+
+    def test_dummy_filter_bank(self): 
+        self.assert_equal_to_filters(DummyFilterStrategy)
+
+    def test_numpy_filter_bank(self): 
+        self.assert_equal_to_filters(lambda: NumpyFilterStrategy(np.mean))
+
+    def test_polynomial_filter_bank(self): 
+        self.assert_equal_to_filters(lambda: PolynomialFilterStrategy(poly_degree=2))
+
+    def test_remove(self): 
+        bank = FilterBank(DummyFilterStrategy(), history_size=3)
+        for i in range(0, 3): 
+            bank.add([i, i])
+
+        bank.remove(0)
+
+        # the last row is moved into the removed row
+        self.assertEqual(len(bank), 2)
+        self.assertTrue((bank.eval() == [[2, 2], [1, 1]]).all())
+
+    def test_memoization(self): 
+        bank = FilterBank(DummyFilterStrategy(), history_size=3)
+        for i in range(0, 3): 
+            bank.add([i, i])
+
+        # single rows are answered from the results of all rows
+        result = bank.eval()
+        self.assertTrue((bank.eval_row(1) == [1, 1]).all())
+        self.assertEqual((bank.cache_hits, bank.cache_misses), (1, 1))
+
+        # the results are copies, changing them does not affect the cache
+        result[1] = 0.
+        self.assertTrue((bank.eval() == [[0, 0], [1, 1], [2, 2]]).all())
+        self.assertEqual((bank.cache_hits, bank.cache_misses), (2, 1))
+
+        bank.update([[5, 5], [6, 6], [7, 7]])
+        self.assertTrue((bank.eval_row(2) == [7, 7]).all())
+        self.assertEqual((bank.cache_hits, bank.cache_misses), (2, 2))
+
+    def assert_equal_to_filters(self, strategy_factory): 
+        """
+        Runs a bank and a list of single filters side by side, while adding and removing rows
+        """
+        history_size = 5
+        bank = FilterBank(strategy_factory(), history_size=history_size, capacity=2)
+        filters = []
+
+        rng = np.random.RandomState(0)
+        for step in range(0, 20): 
+            states = rng.rand(len(filters), 3) + step
+
+            bank.update(states)
+            for filter, state in zip(filters, states): 
+                filter.update(state)
+
+            # add a row every other step, remove one every third step
+            if step % 2 == 0: 
+                state = rng.rand(3)
+                bank.add(state)
+                filters.append(Filter(strategy_factory(), history_size=history_size))
+                filters[-1].update(state)
+
+            if step % 3 == 0 and len(filters) > 1: 
+                bank.remove(0)
+                filters[0] = filters[-1]
+                filters.pop()
+
+            for time in [0, 1]: 
+                expected = np.array([filter.eval(time=time) for filter in filters])
+                self.assertTrue(np.allclose(bank.eval(time=time), expected))
\ No newline at end of file
@@ -0,0 +1,133 @@
+from unittest import TestCase
+import numpy as np
+
+from ..simple_filters import Filter, FilterBank, KalmanFilterStrategy, Tracker, predicted_mahalanobis_distance
+
+import pytest
+
+class TestKalmanFilterStrategy(TestCase): 
+
+    def test_constant_velocity(self): 
+        filter = Filter(KalmanFilterStrategy(measurement_noise=1e-2), history_size=1)
+        for i in range(0, 50): 
+            filter.update([i, 2 * i])
+
+        self.assertTrue(np.allclose(filter.eval(), [49, 98], atol=1e-2))
+        self.assertTrue(np.allclose(filter.eval_horizons([1, 10]), [[50, 100], [59, 118]], atol=1e-1))
+
+    def test_constant_acceleration(self): 
+        filter = Filter(KalmanFilterStrategy(model="constant_acceleration", measurement_noise=1e-4), history_size=1)
+        for i in range(0, 50): 
+            filter.update([0.5 * i ** 2])
+
+        self.assertAlmostEqual(filter.eval(time=1)[0], 0.5 * 50 ** 2, delta=0.5)
+
+    def test_variance(self): 
+        strategy = KalmanFilterStrategy()
+        filter = Filter(strategy, history_size=1)
+        variances = []
+        for i in range(0, 10): 
+            filter.update([i, i])
+            variances.append(strategy.eval_variance(time=1)[0])
+
+        # the uncertainty decreases with the first measurements until it converges, and increases with the prediction time
+        self.assertTrue(np.all(np.diff(variances[:5]) < 0))
+        self.assertAlmostEqual(variances[-1], variances[-2], places=5)
+        self.assertTrue(strategy.eval_variance(time=2)[0] > variances[-1])
+
+    def test_fractional_time(self): 
+        strategy = KalmanFilterStrategy()
+        filter = Filter(strategy, history_size=1)
+        for i in range(0, 20): 
+            filter.update([i])
+
+        # the prediction and its variance are not truncated to whole steps
+        self.assertAlmostEqual(filter.eval(time=1.5)[0], 20.5, delta=0.05)
+        variances = [strategy.eval_variance(time=time)[0] for time in [1, 1.5, 2]]
+        self.assertTrue(variances[0] < variances[1] < variances[2])
+
+    def test_filter_bank(self): 
+        rng = np.random.RandomState(0)
+        series = np.cumsum(rng.randn(20, 3, 2), axis=0)
+
+        bank = FilterBank(KalmanFilterStrategy(), history_size=2, capacity=1)
+        filters = [Filter(KalmanFilterStrategy(), history_size=2) for _ in range(0, 3)]
+
+        # the rows start at different times, which grows the bank and requires separate states per row
+        for t in range(0, 20): 
+            states = []
+            for i, filter in enumerate(filters): 
+                if t >= i: 
+                    filter.update(series[t, i])
+                    states.append(series[t, i])
+
+            if t > 0: 
+                bank.update(np.array(states[:len(bank)]))
+
+            if t < len(filters): 
+                bank.add(series[t, t])
+
+            expected = np.array([filter.eval(time=1) for filter in filters[:len(bank)]])
+            self.assertTrue(np.allclose(bank.eval(time=1), expected))
+
+            expected_variance = np.array([filter.strategy.eval_variance(time=1) for filter in filters[:len(bank)]])
+            self.assertTrue(np.allclose(bank.eval_variance(time=1), expected_variance))
+
+        # removing a row moves the state of the last row
+        bank.remove(0)
+        self.assertTrue(np.allclose(bank.eval(time=1)[0], filters[2].eval(time=1)))
+
+    def test_tracker(self): 
+        filter_prototype = Filter(KalmanFilterStrategy(), history_size=1, dtype=np.float32)
+        tracker = Tracker(filter_prototype, distance_threshold=3.0, pairwise_distance_function=predicted_mahalanobis_distance, gating=True)
+
+        for i in range(0, 20): 
+            tracker.update([[i, 0.], [0., i], [10., 10.]])
+
+        result = tracker.to_numpy_array()
+        self.assertEqual(result[:, -1].tolist(), [1, 2, 3])
+        self.assertTrue(np.allclose(result[:, :2], [[19, 0], [0, 19], [10, 10]], atol=0.1))
+
+        # the states of the filters are part of the snapshot
+        restored = Tracker(filter_prototype, distance_threshold=3.0, pairwise_distance_function=predicted_mahalanobis_distance, gating=True)
+        restored.restore(tracker.snapshot())
+        self.assertTrue(np.array_equal(restored.eval_horizons([1, 2]), tracker.eval_horizons([1, 2])))
+
+    def test_coasting(self): 
+        bank = FilterBank(KalmanFilterStrategy(), history_size=1)
+        bank.add([0., 0.])
+        for i in range(1, 10): 
+            bank.update([[i, 0.]])
+
+        # the predictions of coasted rows are not measurements, so their uncertainty grows
+        variances = [bank.eval_variance(time=1)[0, 0]]
+        for _ in range(0, 2): 
+            bank.update(bank.eval(time=1), observed=np.zeros(1, dtype=bool))
+            variances.append(bank.eval_variance(time=1)[0, 0])
+
+        self.assertTrue(variances[0] < variances[1] < variances[2])
+        self.assertTrue(np.allclose(bank.eval(time=1), [[12, 0]], atol=0.1))
+
+        # the tracker coasts its unmatched objects in the same way
+        tracker = Tracker(Filter(KalmanFilterStrategy(), history_size=1), distance_threshold=3.0, max_time_to_live=10)
+        for i in range(0, 10): 
+            tracker.update([[i, 0.]])
+        tracker.update(np.empty((0, 2)))
+        tracker.coast()
+
+        self.assertTrue(np.allclose(tracker.predict(time=1)[1], bank.eval(time=1)))
+
+    def test_filter_series(self): 
+        rng = np.random.RandomState(0)
+        series = np.cumsum(rng.randn(30, 2), axis=0)
+
+        # the series is filtered in one pass, so that the result equals the streaming updates
+        result = Filter(KalmanFilterStrategy(), history_size=4).filter_series(series, time=1)
+        filter = Filter(KalmanFilterStrategy(), history_size=4)
+        for state, filtered_state in zip(series, result): 
+            filter.update(state)
+            self.assertTrue(np.allclose(filter.eval(time=1), filtered_state))
+
+    def test_unknown_model(self): 
+        with pytest.raises(ValueError): 
+            KalmanFilterStrategy(model="constant_jerk")
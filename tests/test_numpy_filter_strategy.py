@@ -1,7 +1,7 @@
 from unittest import TestCase
 import numpy as np
 
-from ..simple_filters import Filter, FilterStrategy, NumpyFilterStrategy
+from ..simple_filters import Filter, FilterStrategy, NumpyFilterStrategy, RunningPercentile
 
 import pytest
 
@@ -18,3 +18,48 @@ class TestFilter(TestCase):
 
         self.assertEqual(result[0], 14.5)
         self.assertEqual(result[1], 15.5)
+
+    def test_running_reducers(self): 
+        functions = [np.sum, np.mean, np.var, np.std, np.min, np.max, np.median, RunningPercentile(25.)]
+        rng = np.random.default_rng(0)
+        states = rng.normal(size=(40, 3))
+        states[:, 2] = np.round(states[:, 2])
+
+        for function in functions: 
+            filter = Filter(NumpyFilterStrategy(function), history_size=7)
+            reference = function.function if isinstance(function, RunningPercentile) else function
+
+            for state in states: 
+                filter.update(state)
+                np.testing.assert_allclose(filter.eval(), reference(filter.get_history(), axis=0), atol=1e-12)
+
+    def test_running_reducers_scalar_states(self): 
+        rng = np.random.default_rng(0)
+        states = rng.normal(size=40)
+
+        for function in [np.min, np.max, np.median, RunningPercentile(75.)]: 
+            filter = Filter(NumpyFilterStrategy(function), history_size=5)
+            reference = function.function if isinstance(function, RunningPercentile) else function
+
+            for state in states: 
+                filter.update(state)
+                np.testing.assert_allclose(filter.eval(), reference(filter.get_history(), axis=0), atol=1e-12)
+
+    def test_running_reducers_single_sample(self): 
+        rng = np.random.default_rng(0)
+        states = rng.normal(size=(10, 2))
+
+        for function in [np.var, np.std, np.mean, np.min, np.median]: 
+            filter = Filter(NumpyFilterStrategy(function), history_size=1)
+            for state in states: 
+                filter.update(state)
+                np.testing.assert_allclose(filter.eval(), function(filter.get_history(), axis=0), atol=1e-12)
+
+    def test_callable_fallback(self): 
+        strategy = NumpyFilterStrategy(lambda history, axis: np.ptp(history, axis=axis))
+        filter = Filter(strategy, history_size=5)
+
+        for i in range(0, 8): 
+            filter.update([i, 2 * i])
+
+        np.testing.assert_array_equal(filter.eval(), [4, 8])
@@ -1,6 +1,7 @@
 import time
 from unittest import TestCase
 import pytest
+import numpy as np
 
 from ..simple_filters import Filter, PolynomialFilterStrategy
 
@@ -74,6 +75,75 @@ class TestCarFilter(TestCase):
         self.assertAlmostEqual(result[2], 12.)
         self.assertAlmostEqual(result[3], 13.)
 
+    def test_projection_matches_polyfit(self): 
+        strategy = PolynomialFilterStrategy(poly_degree=2, reject_outliers=False)
+        self.filter = Filter(strategy, history_size=self.history_size)
+
+        history = np.random.rand(self.history_size, 3)
+        for state in history: 
+            self.filter.update(state)
+
+        x = np.arange(self.history_size)
+        for time in [0, 1, 5]: 
+            expected = [np.polyval(np.polyfit(x, history[:, i], 2), self.history_size - 1 + time) for i in range(3)]
+            result = self.filter.eval(time=time)
+
+            for r, e in zip(result, expected): 
+                self.assertAlmostEqual(r, e)
+
+    def test_outliers_per_dimension(self): 
+        strategy = PolynomialFilterStrategy(poly_degree=2, outlier_rejection_ratio=2.0)
+        self.filter = Filter(strategy, history_size=self.history_size)
+
+        # every dimension has its outlier at a different position
+        history = np.tile(np.arange(self.history_size, dtype=float)[:, np.newaxis], (1, 3))
+        for i in range(3): 
+            history[2 * i + 1, i] += 50.
+
+        for state in history: 
+            self.filter.update(state)
+
+        result = self.filter.eval(time=1)
+        for r in result: 
+            self.assertAlmostEqual(r, 10.)
+
+    def test_constant_dimension(self): 
+        strategy = PolynomialFilterStrategy(poly_degree=3, outlier_rejection_ratio=2.0)
+        self.filter = Filter(strategy, history_size=self.history_size)
+
+        for i in range(0, self.history_size): 
+            self.filter.update([i, 5.])
+
+        result = self.filter.eval()
+        self.assertAlmostEqual(result[0], 9.)
+        self.assertAlmostEqual(result[1], 5.)
+
+    def test_horizons(self): 
+        strategy = PolynomialFilterStrategy(poly_degree=2, filter_weight=0.7)
+        self.filter = Filter(strategy, history_size=self.history_size)
+
+        # the first dimension contains an outlier, so that it is fitted separately
+        for i in range(0, self.history_size): 
+            self.filter.update([i ** 2 + (50. if i == 4 else 0.), i])
+
+        times = [-2, 0, 1, 5, 30]
+        result = self.filter.eval_horizons(times)
+
+        self.assertEqual(result.shape, (len(times), 2))
+        for time, r in zip(times, result): 
+            np.testing.assert_allclose(r, self.filter.eval(time=time))
+
+    def test_fractional_time(self): 
+        strategy = PolynomialFilterStrategy(poly_degree=2, filter_weight=0.5)
+        self.filter = Filter(strategy, history_size=self.history_size)
+        for i in range(0, self.history_size): 
+            self.filter.update([i ** 2])
+
+        # future times are not truncated, past times are blended with the nearest raw sample
+        latest = (self.history_size - 1) ** 2
+        self.assertAlmostEqual(self.filter.eval(time=1.5)[0], (self.history_size + 0.5) ** 2)
+        self.assertAlmostEqual(self.filter.eval(time=-0.4)[0], 0.5 * (self.history_size - 1.4) ** 2 + 0.5 * latest)
+
     def generate_linear_state_history(self): 
         """
         Generates a simple linear succession of values 
@@ -0,0 +1,60 @@
+from unittest import TestCase
+import numpy as np
+
+from ..simple_filters import Filter, FilterBank, PolynomialFilterStrategy, RecursivePolynomialFilterStrategy
+
+import pytest
+
+class TestRecursivePolynomialFilterStrategy(TestCase): 
+
+    def test_equal_to_polynomial_filter(self): 
+        for history_size, poly_degree in [(10, 3), (100, 2)]: 
+            filter = Filter(RecursivePolynomialFilterStrategy(poly_degree=poly_degree, filter_weight=0.8), history_size=history_size)
+            reference = Filter(PolynomialFilterStrategy(poly_degree=poly_degree, reject_outliers=False, filter_weight=0.8), history_size=history_size)
+
+            # a random walk with an offset, which requires a numerically stable update
+            rng = np.random.RandomState(0)
+            states = np.cumsum(rng.randn(1000, 3), axis=0) + 1000.
+
+            for state in states: 
+                filter.update(state)
+                reference.update(state)
+
+                for time in [0, 1]: 
+                    self.assertTrue(np.allclose(filter.eval(time=time), reference.eval(time=time), rtol=0, atol=1e-6))
+
+    def test_filter_bank(self): 
+        bank = FilterBank(RecursivePolynomialFilterStrategy(poly_degree=1), history_size=5)
+        bank.add([0., 0.])
+
+        for i in range(1, 10): 
+            bank.update([[i, 2 * i]])
+
+        result = bank.eval(time=1)
+        self.assertAlmostEqual(result[0, 0], 10.)
+        self.assertAlmostEqual(result[0, 1], 20.)
+
+    def test_horizons(self): 
+        filter = Filter(RecursivePolynomialFilterStrategy(poly_degree=2, filter_weight=0.8), history_size=10)
+        bank = FilterBank(RecursivePolynomialFilterStrategy(poly_degree=2, filter_weight=0.8), history_size=10)
+        bank.add([0., 0.])
+        filter.update([0., 0.])
+
+        for i in range(1, 15): 
+            filter.update([i ** 2, -i])
+            bank.update([[i ** 2, -i]])
+
+        times = [-1, 0, 1, 10]
+        expected = np.array([filter.eval(time=time) for time in times])
+
+        self.assertTrue(np.allclose(filter.eval_horizons(times), expected))
+        self.assertTrue(np.allclose(bank.eval_horizons(times)[0], expected))
+
+    def test_fractional_time(self): 
+        filter = Filter(RecursivePolynomialFilterStrategy(poly_degree=2), history_size=10)
+        for i in range(0, 10): 
+            filter.update([i ** 2])
+
+        self.assertAlmostEqual(filter.eval(time=1.5)[0], 110.25)
+        self.assertAlmostEqual(filter.eval_horizons([-0.5, 0.5])[1, 0], 90.25)
+        self.assertAlmostEqual(filter.filter_series(np.arange(10.)[:, np.newaxis] ** 2, time=1.5)[-1, 0], 110.25)
@@ -0,0 +1,57 @@
+from unittest import TestCase
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, DummyFilterStrategy
+from ..simple_filters.replay import iter_frames, replay, replay_to_columns, sweep
+
+import pytest
+
+class TestReplay(TestCase): 
+
+    def setUp(self): 
+        self.filter_prototype = Filter(DummyFilterStrategy(), history_size=5)
+
+        # two objects moving in parallel, the second one disappears in frame 2
+        self.frame_indices = np.array([0, 0, 1, 1, 2, 3, 3])
+        self.states = np.array([[0., 0.], [5., 5.], [0.1, 0.], [5.1, 5.], [0.2, 0.], [0.3, 0.], [5.3, 5.]])
+
+    def test_iter_frames(self): 
+        frames = list(iter_frames(self.frame_indices, self.states, number_of_frames=5))
+
+        self.assertEqual([frame.shape[0] for frame in frames], [2, 2, 1, 2, 0])
+        self.assertTrue((frames[2] == [[0.2, 0.]]).all())
+
+    def test_replay(self): 
+        tracker = Tracker(self.filter_prototype, distance_threshold=1.0)
+        results = list(replay(tracker, iter_frames(self.frame_indices, self.states)))
+
+        self.assertEqual([i for i, _ in results], [0, 1, 2, 3])
+        self.assertEqual(list(results[3][1][:, -1]), [1, 3])
+
+    def test_replay_to_columns(self): 
+        tracker = Tracker(self.filter_prototype, distance_threshold=1.0)
+        frames, ids, states = replay_to_columns(tracker, iter_frames(self.frame_indices, self.states), capacity=2)
+
+        self.assertEqual(list(frames), [0, 0, 1, 1, 2, 3, 3])
+        self.assertEqual(list(ids), [1, 2, 1, 2, 1, 1, 3])
+        self.assertTrue(np.allclose(states, self.states))
+
+    def test_replay_to_columns_large_ids(self): 
+        # ids beyond 2^24 cannot be represented exactly in the float32 result of to_numpy_array
+        tracker = Tracker(self.filter_prototype, distance_threshold=1.0)
+        tracker.object_counter = 2 ** 24
+        _, ids, _ = replay_to_columns(tracker, iter_frames(self.frame_indices, self.states))
+
+        self.assertEqual(ids.dtype, np.int64)
+        self.assertEqual(list(ids - 2 ** 24), [1, 2, 1, 2, 1, 1, 3])
+
+    def test_sweep(self): 
+        parameter_sets = [dict(distance_threshold=1.0, max_time_to_live=1), dict(distance_threshold=1.0, max_time_to_live=2)]
+        frames = list(iter_frames(self.frame_indices, self.states))
+
+        for processes in [1, 2]: 
+            results = sweep(self.filter_prototype, parameter_sets, frames, processes=processes)
+
+            # with a longer time to live, the second object is retained
+            self.assertEqual(list(results[0][1][-2:]), [1, 3])
+            self.assertEqual(list(results[1][1][-2:]), [1, 2])
\ No newline at end of file
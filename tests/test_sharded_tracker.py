@@ -0,0 +1,79 @@
+from unittest import TestCase
+from functools import partial
+import multiprocessing
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, PolynomialFilterStrategy, DummyFilterStrategy
+from ..simple_filters.sharded_tracker import ShardedTracker
+
+import pytest
+
+class TestShardedTracker(TestCase): 
+
+    def setUp(self): 
+        self.tracker_factory = partial(Tracker, Filter(PolynomialFilterStrategy(poly_degree=1), history_size=5), 
+                                       distance_threshold=0.5, max_time_to_live=2, time_to_birth=2, gating=True)
+
+    def test_thread_executor(self): 
+        self.assert_equivalent(ShardedTracker(self.tracker_factory, tile_size=25., executor="thread", max_workers=2))
+
+    def test_process_executor(self): 
+        self.assert_equivalent(ShardedTracker(self.tracker_factory, tile_size=25., executor="process", max_workers=2))
+
+    def test_dense_scene(self): 
+        # the objects of neighbouring tiles compete for the same states near the borders
+        tracker_factory = partial(Tracker, Filter(PolynomialFilterStrategy(poly_degree=1), history_size=5), 
+                                  distance_threshold=1.0, max_time_to_live=2, time_to_birth=2, gating=True)
+        sharded_tracker = ShardedTracker(tracker_factory, tile_size=10., executor="thread", max_workers=2)
+        self.assert_equivalent(sharded_tracker, tracker_factory, number_of_objects=250, size=30., velocity=0.3, noise=0.1, frames=15)
+
+    def test_dead_workers(self): 
+        sharded_tracker = ShardedTracker(self.tracker_factory, tile_size=25., executor="process", max_workers=2)
+        sharded_tracker.update([[1., 1.], [30., 30.]])
+
+        for process in multiprocessing.active_children(): 
+            process.kill()
+            process.join()
+
+        # closing the tracker must not fail
+        sharded_tracker.close()
+
+    def test_handoff(self): 
+        tracker_factory = partial(Tracker, Filter(DummyFilterStrategy(), history_size=5), distance_threshold=1.0)
+
+        with ShardedTracker(tracker_factory, tile_size=10., executor="thread", max_workers=2) as tracker: 
+            # the objects cross the borders of the tiles in both directions and keep their ids
+            for t in range(0, 30): 
+                result = tracker.update([[0.5 * t, 5.], [15. - 0.5 * t, 15.]], labels=[0, 1])
+                self.assertEqual(result[:, -1].tolist(), [1, 2])
+
+            self.assertEqual(tracker.number_of_tiles, 2)
+            self.assertEqual(tracker.object_counter, 2)
+
+    def test_margin(self): 
+        with pytest.raises(ValueError): 
+            ShardedTracker(self.tracker_factory, tile_size=25., margin=0.1)
+
+        with pytest.raises(ValueError): 
+            ShardedTracker(self.tracker_factory, tile_size=25., executor="unknown")
+
+    def assert_equivalent(self, sharded_tracker, tracker_factory=None, number_of_objects=300, size=100., velocity=0.2, noise=0.02, frames=20): 
+        # objects moving through a scene of tiles, some of them are missed in each frame
+        rng = np.random.RandomState(0)
+        positions = rng.rand(number_of_objects, 2) * size
+        velocities = rng.randn(number_of_objects, 2) * velocity
+        tracker = (tracker_factory or self.tracker_factory)()
+
+        with sharded_tracker: 
+            for t in range(0, frames): 
+                positions += velocities
+                states = (positions + rng.randn(number_of_objects, 2) * noise)[rng.rand(number_of_objects) > 0.05]
+
+                tracker.update(states)
+                expected = tracker.to_numpy_array()
+                result = sharded_tracker.update(states)
+
+                self.assertEqual(result.shape, expected.shape)
+                self.assertTrue(np.allclose(result, expected, atol=1e-4))
+
+            self.assertEqual(sharded_tracker.object_counter, tracker.object_counter)
@@ -0,0 +1,90 @@
+from unittest import TestCase
+import os
+import tempfile
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, PolynomialFilterStrategy
+from ..simple_filters.snapshot import read_snapshot
+
+import pytest
+
+class TestSnapshot(TestCase): 
+
+    def test_restore_bytes(self): 
+        self.assert_restored(lambda tracker: tracker.snapshot())
+
+    def test_restore_file(self): 
+        with tempfile.TemporaryDirectory() as directory: 
+            path = os.path.join(directory, "tracker.snapshot")
+
+            def snapshot(tracker): 
+                with open(path, "wb") as f: 
+                    tracker.snapshot(f)
+
+                return path
+
+            self.assert_restored(snapshot)
+
+    def test_restore_empty(self): 
+        tracker = self.create_tracker()
+        restored = self.create_tracker()
+        restored.restore(tracker.snapshot())
+
+        restored.update([[1., 1.]])
+        self.assertEqual(restored.object_counter, 1)
+
+    def test_history_size_mismatch(self): 
+        tracker = Tracker(Filter(PolynomialFilterStrategy(), history_size=10))
+
+        with pytest.raises(ValueError): 
+            tracker.restore(self.create_tracker().snapshot())
+
+    def test_version_mismatch(self): 
+        snapshot = self.create_tracker().snapshot()
+        corrupt = snapshot.replace(b'"version": 1', b'"version": 9')
+        self.assertNotEqual(corrupt, snapshot)
+
+        with pytest.raises(ValueError): 
+            self.create_tracker().restore(corrupt)
+
+    def test_short_histories_zero_filled(self): 
+        tracker = self.create_tracker()
+        for i in range(0, 5): 
+            tracker.update([[1. + i, 1.]])
+
+        # the object is removed and the buffer row is reused by a new object with a short history
+        for _ in range(0, 3): 
+            tracker.update([[50., 50.]])
+
+        _, columns = read_snapshot(tracker.snapshot())
+        self.assertEqual(columns["lengths"].tolist(), [3])
+        self.assertTrue((columns["histories"][0, :2] == 0).all())
+        self.assertTrue((columns["histories"][0, 2:] == 50.).all())
+
+    def create_tracker(self): 
+        return Tracker(Filter(PolynomialFilterStrategy(poly_degree=1), history_size=5), max_time_to_live=2, time_to_birth=2)
+
+    def generate_frames(self): 
+        rng = np.random.RandomState(0)
+        for i in range(0, 20): 
+            # objects appear and disappear, so that the histories have different lengths
+            states = np.array([[i, 0.], [0., 2 * i], [10., i], [-i, -i]]) + rng.normal(scale=0.01, size=(4, 2))
+            yield states[rng.uniform(size=4) > 0.2]
+
+    def assert_restored(self, snapshot): 
+        frames = list(self.generate_frames())
+        tracker = self.create_tracker()
+        for states in frames[:10]: 
+            tracker.update(states)
+
+        restored = self.create_tracker()
+        restored.restore(snapshot(tracker))
+        self.assertEqual(restored.object_counter, tracker.object_counter)
+
+        # the restored tracker continues exactly like the original one
+        for states in frames[10:]: 
+            tracker.update(states)
+            restored.update(states)
+
+            self.assertTrue(np.array_equal(restored.to_numpy_array(), tracker.to_numpy_array()))
+            self.assertTrue(np.array_equal(restored.eval_horizons([1]), tracker.eval_horizons([1])))
@@ -42,6 +42,170 @@ class TestTracker(TestCase):
         self.tracker.update(self.generate_static_states(2))
         self.assertTrue((self.tracker.to_numpy_array() == reference_matrix).all())
 
+    def test_tracker_churn(self): 
+        # objects disappear in between, so that rows of the track table are reused
+        self.tracker.update([[1., 1.], [5., 5.], [9., 9.]])
+        self.tracker.update([[5., 5.], [9., 9.]])
+        self.tracker.update([[5., 5.], [13., 13.]])
+
+        ids = [tracked_object.id for tracked_object in self.tracker.get_tracked_objects()]
+        self.assertEqual(ids, [2, 4])
+
+        for tracked_object, row in zip(self.tracker.get_tracked_objects(), self.tracker.to_numpy_array()): 
+            self.assertTrue((tracked_object.eval() == row[:2]).all())
+            self.assertEqual(tracked_object.time_to_live, 1)
+            self.assertTrue(tracked_object.is_born)
+
+    def test_tracker_horizons(self): 
+        for i in range(0, 5): 
+            self.tracker.update([[i, 1.], [10. + i, 10.]])
+
+        result = self.tracker.eval_horizons(range(1, 4))
+        self.assertEqual(result.shape, (2, 3, 2))
+
+        for tracked_object, horizons in zip(self.tracker.get_tracked_objects(), result): 
+            np.testing.assert_allclose(horizons, tracked_object.eval_horizons(range(1, 4)))
+            np.testing.assert_allclose(horizons[0], tracked_object.eval(time=1))
+
+    def test_tracker_memoization(self): 
+        self.tracker.update([[1., 1.], [5., 5.]])
+        self.tracker.update([[1., 1.], [5., 5.]])
+
+        # the filtered states are evaluated once for all objects
+        misses = self.tracker.cache_misses
+        self.tracker.to_numpy_array()
+        for tracked_object in self.tracker.get_tracked_objects(): 
+            tracked_object.eval()
+
+        self.assertEqual(self.tracker.cache_misses, misses + 1)
+        self.assertEqual(self.tracker.cache_hits, 2)
+
+    def test_tracker_stats(self): 
+        collected_stats = []
+        tracker = Tracker(Filter(PolynomialFilterStrategy(), history_size=10), max_time_to_live=2, time_to_birth=2, stats_callback=collected_stats.append)
+
+        tracker.update([[1., 1.], [5., 5.]])
+        tracker.update([[1., 1.], [9., 9.]])
+
+        stats = collected_stats[-1]
+        self.assertIs(tracker.last_stats, stats)
+        self.assertEqual(stats.matrix_shape, (2, 2))
+        self.assertEqual((stats.matched, stats.coasted, stats.removed, stats.added, stats.born), (1, 1, 1, 1, 1))
+        self.assertEqual(set(stats.durations), set(stats.STAGES))
+        self.assertTrue(stats.total > 0)
+
+        # without instrumentation, nothing is recorded
+        self.tracker.update([[1., 1.]])
+        self.assertIsNone(self.tracker.last_stats)
+
+    def test_tracker_buffers(self): 
+        tracker = Tracker(Filter(PolynomialFilterStrategy(), history_size=10, dtype=np.float32))
+        states = np.empty((2, 2), dtype=np.float32)
+        out = np.zeros((8, 3), dtype=np.float32)
+
+        for i in range(0, 3): 
+            states[:] = [[i, 1.], [10. + i, 10.]]
+            tracker.update(states)
+            result = tracker.to_numpy_array(out=out)
+
+            # the result is a view to the preallocated array
+            self.assertIs(result.base, out)
+            self.assertEqual(result.shape, (2, 3))
+            self.assertTrue(np.allclose(result, [[i, 1., 1.], [10. + i, 10., 2.]]))
+
+        self.assertTrue(np.allclose(tracker.to_numpy_array(), result))
+
+        with pytest.raises(ValueError): 
+            tracker.to_numpy_array(out=np.zeros((1, 3), dtype=np.float32))
+
+    def test_tracker_events(self): 
+        collected_events = []
+        tracker = Tracker(Filter(PolynomialFilterStrategy(), history_size=10), max_time_to_live=2, time_to_birth=2, event_callback=collected_events.append)
+
+        events = tracker.update([[1., 1.], [5., 5.]])
+        self.assertEqual(events.born.tolist(), [])
+
+        events = tracker.update([[1., 1.], [9., 9.]])
+        self.assertIs(tracker.last_events, events)
+        self.assertIs(collected_events[-1], events)
+        self.assertEqual(events.born.tolist(), [1])
+        self.assertEqual(events.matched.tolist(), [])
+
+        events = tracker.update([[9., 9.]])
+        self.assertEqual((events.born.tolist(), events.matched.tolist()), ([3], []))
+        self.assertEqual((events.coasted.tolist(), events.removed.tolist()), ([1], []))
+
+        events = tracker.update([[9., 9.]])
+        self.assertEqual((events.matched.tolist(), events.coasted.tolist(), events.removed.tolist()), ([3], [1], [1]))
+
+        # without collection, update returns nothing
+        self.assertIsNone(self.tracker.update([[1., 1.]]))
+        self.assertIsNone(self.tracker.last_events)
+
+    def test_tracker_lookup(self): 
+        tracker = Tracker(Filter(PolynomialFilterStrategy(), history_size=10), time_to_birth=2, max_time_to_live=2, collect_events=True)
+
+        tracker.update([[1., 1.], [5., 5.]])
+        self.assertIsNone(tracker.get_tracked_object(1))
+
+        tracker.update([[1., 1.], [5., 5.], [9., 9.]])
+        self.assertTrue((tracker.get_tracked_object(2).eval() == [5., 5.]).all())
+        self.assertEqual([tracked_object.id for tracked_object in tracker.get_tracked_objects()], [1, 2])
+
+        # the set of born objects is restored from a snapshot
+        restored = Tracker(Filter(PolynomialFilterStrategy(), history_size=10), time_to_birth=2)
+        restored.restore(tracker.snapshot())
+        self.assertEqual([tracked_object.id for tracked_object in restored.get_tracked_objects()], [1, 2])
+        self.assertIsNone(restored.get_tracked_object(3))
+
+    def test_tracker_labels(self): 
+        tracker = Tracker(Filter(PolynomialFilterStrategy(), history_size=10), distance_threshold=1.0, 
+                          class_parameters={1: {"distance_threshold": 5.0, "time_to_birth": 2, "max_time_to_live": 2}})
+
+        tracker.update([[1., 1.], [1.2, 1.2], [10., 10.]], labels=[0, 1, 1])
+        self.assertEqual([tracked_object.id for tracked_object in tracker.get_tracked_objects()], [1])
+
+        # objects are only matched within their label, with the threshold of the label
+        tracker.update([[1.1, 1.1], [1.1, 1.1], [13., 13.]], labels=[1, 0, 1])
+        self.assertEqual([tracked_object.id for tracked_object in tracker.get_tracked_objects()], [1, 2, 3])
+        self.assertEqual(tracker.get_labels().tolist(), [0, 1, 1])
+        self.assertTrue(np.allclose(tracker.to_numpy_array()[:, :2], [[1.1, 1.1], [1.1, 1.1], [13., 13.]]))
+
+        # the labels are part of the snapshot
+        restored = Tracker(Filter(PolynomialFilterStrategy(), history_size=10))
+        restored.restore(tracker.snapshot())
+        self.assertEqual(restored.get_labels().tolist(), [0, 1, 1])
+        self.assertEqual(restored.get_tracked_object(3).label, 1)
+
+        with pytest.raises(ValueError): 
+            tracker.update([[1., 1.]], labels=[0, 1])
+
+        with pytest.raises(ValueError): 
+            Tracker(Filter(PolynomialFilterStrategy()), class_parameters={1: {"threshold": 1.0}})
+
+    def test_tracker_transfer(self): 
+        for i in range(0, 3): 
+            self.tracker.update([[i, 1.], [10. + i, 10.]])
+
+        expected = self.tracker.to_numpy_array()
+        ids, state_indices, distances = self.tracker.match([[12., 10.], [2.2, 1.]])
+        self.assertEqual((ids.tolist(), state_indices.tolist()), ([1, 2], [1, 0]))
+        self.assertTrue(np.allclose(distances, [0.2, 0.]))
+
+        # the candidates contain all pairs within the distance threshold
+        _, (ids, state_indices, distances) = self.tracker.match([[12., 10.], [2.2, 1.], [2.5, 1.]], candidates=True)
+        self.assertEqual(sorted(zip(ids.tolist(), state_indices.tolist())), [(1, 1), (1, 2), (2, 0)])
+
+        # an object is moved to another tracker, which continues it with its history
+        other = Tracker(Filter(PolynomialFilterStrategy(), history_size=10), distance_threshold=1.0)
+        other.insert_tracks(self.tracker.extract_tracks([2]))
+        self.assertTrue(np.allclose(other.to_numpy_array(), expected[1:]))
+        self.assertEqual(self.tracker.predict()[0].tolist(), [1])
+
+        other.update([[13., 10.], [50., 50.]], matches=([2], [0]), new_ids=[7])
+        self.assertEqual(other.to_numpy_array()[:, -1].tolist(), [2, 7])
+        self.assertEqual(other.object_counter, 7)
+
     def static_update_and_assert(self, number_of_states, assert_number_of_tracked_objects, assert_object_counter): 
         self.tracker.update(self.generate_static_states(number_of_states, with_noise=True))
         self.assertEqual(len(self.tracker.get_tracked_objects()), assert_number_of_tracked_objects)
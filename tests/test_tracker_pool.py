@@ -0,0 +1,74 @@
+from unittest import TestCase
+from functools import partial
+import multiprocessing
+import os
+import numpy as np
+
+from ..simple_filters import Tracker, Filter, DummyFilterStrategy
+from ..simple_filters.tracker_pool import TrackerPool
+
+import pytest
+
+class FailingTracker: 
+    """
+    A picklable tracker, which fails on every update
+    """
+
+    def update(self, states): 
+        raise ValueError("Invalid states")
+
+class TestTrackerPool(TestCase): 
+
+    def setUp(self): 
+        self.tracker_factory = partial(Tracker, Filter(DummyFilterStrategy(), history_size=5), distance_threshold=1.0)
+
+    def test_thread_pool(self): 
+        self.assert_streams(TrackerPool(self.tracker_factory, executor="thread", max_workers=2))
+
+    def test_process_pool(self): 
+        self.assert_streams(TrackerPool(self.tracker_factory, executor="process", max_workers=2))
+
+    def test_process_pool_exception(self): 
+        with TrackerPool(FailingTracker, executor="process", max_workers=2) as pool: 
+            # the exception of the worker is raised in the pool, which can still be used afterwards
+            for _ in range(0, 2): 
+                with pytest.raises(ValueError): 
+                    pool.update({0: np.zeros((1, 2)), 1: np.zeros((1, 2))})
+
+    def test_process_pool_dead_workers(self): 
+        shared_memory_directory = "/dev/shm"
+        blocks = set(os.listdir(shared_memory_directory)) if os.path.isdir(shared_memory_directory) else set()
+
+        pool = TrackerPool(self.tracker_factory, executor="process", max_workers=2)
+        pool.update({0: np.zeros((1, 2)), 1: np.zeros((1, 2))})
+
+        for process in multiprocessing.active_children(): 
+            process.kill()
+            process.join()
+
+        # closing the pool must not fail and still release the shared memory
+        pool.close()
+        if os.path.isdir(shared_memory_directory): 
+            self.assertEqual(set(os.listdir(shared_memory_directory)) - blocks, set())
+
+    def assert_streams(self, pool): 
+        with pool: 
+            for t in range(0, 5): 
+                # every stream has two moving objects, the second one of stream 1 disappears
+                frames = {}
+                for stream_id in range(0, 3): 
+                    states = np.array([[0.1 * t, 0.], [5. + 0.1 * t, 0.]])
+                    frames[stream_id] = states[:1] if stream_id == 1 and t >= 3 else states
+
+                # a larger frame, which requires more shared memory
+                if t == 4: 
+                    frames[3] = np.random.rand(100, 2) * 1000.
+
+                results = pool.update(frames)
+
+        # the object ids are independent for every stream
+        self.assertEqual(list(results[0][:, -1]), [1, 2])
+        self.assertEqual(list(results[1][:, -1]), [1])
+        self.assertEqual(list(results[2][:, -1]), [1, 2])
+        self.assertEqual(results[3].shape, (100, 3))
+        self.assertTrue(np.allclose(results[0][:, 0], [0.4, 5.4]))
\ No newline at end of file